@@ -27,7 +27,16 @@ design choice has been made as procset aims at managing resources for
 scheduling. Hence, the manipulated intervals can be represented as indexes.
 """
 
+import array as _array
+import bisect as _bisect
+import collections as _collections
+import functools as _functools
+import itertools as _itertools
+import mmap as _mmap
 import operator as _operator
+import os as _os
+import re as _re
+import sys as _sys
 
 
 class ProcInt(tuple):
@@ -51,8 +60,9 @@ class ProcInt(tuple):
             raise ValueError('Invalid negative bound(s)')
         return tuple.__new__(cls, (inf, sup))
 
-    def __getnewargs__(self):
-        return tuple(self)
+    def __reduce__(self):
+        # the bounds of a pickled ProcInt are valid: bypass their validation
+        return (_restore_procint, tuple(self))
 
     def __repr__(self):
         """Return a nicely formatted representation string."""
@@ -80,31 +90,692 @@ class ProcInt(tuple):
     sup = property(_operator.itemgetter(1), doc='Alias for field number 1')
 
 
-class _Sentinel:
-    """Helper class whose instances are greater than any object."""
+def _pairs(bounds):
+    """Iterate over the (inf, sup) pairs of a flat list of interval bounds."""
+    # Note that we are feeding the same iterator twice to zip.
+    # The iterated bounds are hence grouped by pairs (lower and upper bounds of
+    # the intervals).
+    it = iter(bounds)
+    return zip(it, it)
 
-    __slots__ = ()
 
-    def __eq__(self, other):
-        return self is other
+# Greatest interval bound that fits in the flat array of bounds of a ProcSet.
+_MAX_BOUND = 2 ** 63 - 1
 
-    def __lt__(self, other):
+
+def _bound_overflow():
+    """Return the error raised for bounds that do not fit in an array of bounds."""
+    return ValueError('Invalid bound(s) greater than {}'.format(_MAX_BOUND))
+
+
+def _new_bounds(iterable=()):
+    """Create a new flat list of interval bounds."""
+    try:
+        return _array.array('q', iterable)
+    except OverflowError:
+        raise _bound_overflow() from None
+
+
+def _coalesce(itvs):
+    """
+    Return the bounds of the union of the (unordered) intervals in itvs.
+
+    The intervals are sorted once, and then coalesced in a single pass.
+    Hence, building a ProcSet from k intervals is in O(k log k) instead of the
+    O(k²) needed to merge the intervals one at a time.
+    """
+    bounds = _new_bounds()
+    append = bounds.append
+    cur_inf = cur_sup = -2  # sentinel interval, dropped at the end
+    try:
+        for inf, sup in sorted(itvs):
+            # adjacent intervals are coalesced as well, as bounds are integers
+            if inf <= cur_sup + 1:
+                if sup > cur_sup:
+                    cur_sup = sup
+            else:
+                append(cur_inf)
+                append(cur_sup)
+                cur_inf, cur_sup = inf, sup
+        if cur_sup >= 0:  # non-empty result
+            append(cur_inf)
+            append(cur_sup)
+            del bounds[:2]
+    except OverflowError:
+        raise _bound_overflow() from None
+    return bounds
+
+
+def _gallop(bounds, value, lo=0, right=False):
+    """
+    Locate the insertion point for value in bounds, starting from lo.
+
+    The result is the same as bisect_left(bounds, value, lo) (or bisect_right
+    if right is True).  However, the search range is first narrowed by an
+    exponential search starting from lo: the cost of the search is hence
+    logarithmic in the distance between lo and the insertion point, rather
+    than in the length of bounds.
+    """
+    below = _operator.le if right else _operator.lt
+    size = len(bounds)
+    step, hi = 1, lo + 1
+    while hi <= size and below(bounds[hi - 1], value):
+        lo = hi
+        step *= 2
+        hi = lo + step
+    bisect = _bisect.bisect_right if right else _bisect.bisect_left
+    return bisect(bounds, value, lo, min(hi, size))
+
+
+def _isskewed(small_size, big_size):
+    """
+    Return True if galloping over the big operand is cheaper than a linear
+    sweep over both operands.
+    """
+    return small_size * big_size.bit_length() < big_size
+
+
+def _clip_into(out, bounds, inf, sup, lo=0):
+    """
+    Append the bounds of the intersection of bounds and [inf, sup] to out.
+
+    The intersection is searched from index lo of bounds onwards.  Return the
+    index of bounds from which subsequent searches (for intervals greater
+    than sup) may start.
+    """
+    start = _gallop(bounds, inf, lo)
+    stop = _gallop(bounds, sup, start, right=True)
+    # round the (flat) indexes to the enclosing intervals
+    start -= start & 1
+    end = stop + (stop & 1)
+    if start < end:
+        # bounds may be read-only: clip the outermost bounds while copying
+        out.append(max(bounds[start], inf))
+        out.extend(bounds[start + 1:end - 1])
+        out.append(min(bounds[end - 1], sup))
+    return stop
+
+
+def _union_skewed(big, small):
+    """Return the bounds of big | small, galloping over big."""
+    out = _new_bounds()
+    lo = 0
+    for inf, sup in _pairs(small):
+        # intervals of big that overlap or are adjacent to [inf, sup]
+        start = _gallop(big, inf - 1, lo)
+        stop = _gallop(big, sup + 1, start, right=True)
+        start -= start & 1
+        stop += stop & 1
+        out.extend(big[lo:start])  # untouched intervals are copied as is
+        if start < stop:
+            inf = min(inf, big[start])
+            sup = max(sup, big[stop - 1])
+        if out and inf <= out[-1] + 1:  # merged with the previous interval
+            out[-1] = max(out[-1], sup)
+        else:
+            out.append(inf)
+            out.append(sup)
+        lo = max(lo, stop)
+    out.extend(big[lo:])
+    return out
+
+
+def _intersection_skewed(big, small):
+    """Return the bounds of big & small, galloping over big."""
+    out = _new_bounds()
+    lo = 0
+    for inf, sup in _pairs(small):
+        lo = _clip_into(out, big, inf, sup, lo)
+    return out
+
+
+def _difference_skewed(big, small):
+    """Return the bounds of big - small, galloping over big."""
+    out = _new_bounds()
+    if not big:
+        return out
+    lo, gap_inf = 0, big[0]
+    for inf, sup in _pairs(small):
+        # keep the part of big lying in the gap before [inf, sup]
+        if gap_inf < inf:
+            lo = _clip_into(out, big, gap_inf, inf - 1, lo)
+        gap_inf = sup + 1
+    if gap_inf <= big[-1]:
+        _clip_into(out, big, gap_inf, big[-1], lo)
+    return out
+
+
+def _difference_small(small, big):
+    """Return the bounds of small - big, galloping over big."""
+    out = _new_bounds()
+    lo = 0
+    for inf, sup in _pairs(small):
+        start = _gallop(big, inf, lo)
+        stop = _gallop(big, sup, start, right=True)
+        cur = inf
+        for big_inf, big_sup in _pairs(big[start - (start & 1):stop + (stop & 1)]):
+            if cur < big_inf:
+                out.append(cur)
+                out.append(big_inf - 1)
+            cur = big_sup + 1
+        if cur <= sup:
+            out.append(cur)
+            out.append(sup)
+        lo = stop
+    return out
+
+
+def _issubset_skewed(small, big):
+    """Test whether small <= big, galloping over big."""
+    lo = 0
+    size = len(big)
+    for inf, sup in _pairs(small):
+        lo = _gallop(big, inf, lo)
+        if lo & 1:  # inf lies inside the interval ending at big[lo]
+            if big[lo] < sup:
+                return False
+        elif lo == size or big[lo] != inf or big[lo + 1] < sup:
+            return False
+    return True
+
+
+def _union(left, right):
+    """Return the bounds of left | right."""
+    if _isskewed(len(right), len(left)):
+        return _union_skewed(left, right)
+    if _isskewed(len(left), len(right)):
+        return _union_skewed(right, left)
+    # Both operands are sorted: sorting their concatenation is a linear merge
+    # of two runs.
+    return _coalesce(_itertools.chain(_pairs(left), _pairs(right)))
+
+
+def _intersection(left, right):
+    """Return the bounds of left & right."""
+    if _isskewed(len(right), len(left)):
+        return _intersection_skewed(left, right)
+    if _isskewed(len(left), len(right)):
+        return _intersection_skewed(right, left)
+
+    out = _new_bounds()
+    append = out.append
+    lsize, rsize = len(left), len(right)
+    if not lsize or not rsize:
+        return out
+    i = j = 0
+    linf, lsup, rinf, rsup = left[0], left[1], right[0], right[1]
+    while True:
+        # emit the overlap (if any) of the current intervals, then move past
+        # the interval ending first
+        if lsup < rsup:
+            if rinf <= lsup:
+                append(linf if linf > rinf else rinf)
+                append(lsup)
+            i += 2
+            if i == lsize:
+                return out
+            linf, lsup = left[i], left[i + 1]
+        else:
+            if linf <= rsup:
+                append(linf if linf > rinf else rinf)
+                append(rsup)
+            j += 2
+            if j == rsize:
+                return out
+            rinf, rsup = right[j], right[j + 1]
+
+
+def _difference(left, right):
+    """Return the bounds of left - right."""
+    if _isskewed(len(right), len(left)):
+        return _difference_skewed(left, right)
+    if _isskewed(len(left), len(right)):
+        return _difference_small(left, right)
+
+    out = _new_bounds()
+    append = out.append
+    j, rsize = 0, len(right)
+    for inf, sup in _pairs(left):
+        # skip the intervals of right that end before the current interval
+        while j < rsize and right[j + 1] < inf:
+            j += 2
+        # punch the holes made by the overlapping intervals of right
+        cur = inf
+        while j < rsize and right[j] <= sup:
+            if right[j] > cur:
+                append(cur)
+                append(right[j] - 1)
+            cur = right[j + 1] + 1
+            if cur > sup:  # right[j] may overlap the next interval as well
+                break
+            j += 2
+        if cur <= sup:
+            append(cur)
+            append(sup)
+    return out
+
+
+def _isresizable(bounds):
+    """Test whether the bounds can be resized (hence spliced) in place."""
+    # bounds may wrap a foreign buffer, and resizing an array raises
+    # BufferError while one of its buffers (e.g., a memoryview) is alive
+    if not isinstance(bounds, _array.array):
+        return False
+    try:
+        bounds.append(0)
+    except BufferError:
         return False
+    del bounds[-1]
+    return True
 
-    __le__ = __eq__
 
-    def __gt__(self, other):
+def _union_splice(bounds, added):
+    """
+    Add the intervals of added to bounds, in place.
+
+    Each added interval is located by bisection, and only the slice of bounds
+    it overlaps (or is adjacent to) is replaced.
+    """
+    lo = 0
+    for inf, sup in _pairs(added):
+        start = _bisect.bisect_left(bounds, inf - 1, lo)
+        stop = _bisect.bisect_right(bounds, sup + 1, start)
+        # round the (flat) indexes to the enclosing intervals
+        start -= start & 1
+        stop += stop & 1
+        if start < stop:
+            inf = min(inf, bounds[start])
+            sup = max(sup, bounds[stop - 1])
+        bounds[start:stop] = _new_bounds((inf, sup))
+        lo = start
+
+
+def _difference_splice(bounds, removed):
+    """
+    Remove the intervals of removed from bounds, in place.
+
+    Each removed interval is located by bisection, and only the slice of
+    bounds it overlaps is replaced.
+    """
+    lo = 0
+    for inf, sup in _pairs(removed):
+        start = _bisect.bisect_left(bounds, inf, lo)
+        stop = _bisect.bisect_right(bounds, sup, start)
+        kept = _new_bounds()
+        if start & 1:  # keep the head of the interval holding inf
+            kept.extend((bounds[start - 1], inf - 1))
+        if stop & 1:  # keep the tail of the interval holding sup
+            kept.extend((sup + 1, bounds[stop]))
+        bounds[start - (start & 1):stop + (stop & 1)] = kept
+        lo = start - (start & 1)
+
+
+def _intersection_many(*operands):
+    """
+    Return the bounds of the intersection of all the operands.
+
+    The operands are intersected by increasing number of intervals, so that
+    the running result is as small as possible: intersecting it with the
+    bigger operands then gallops over them.  The sweep stops as soon as the
+    running result is empty.
+    """
+    operands = sorted(operands, key=len)
+    result = _new_bounds(operands[0])
+    for other in operands[1:]:
+        if not result:
+            break
+        result = _intersection(result, other)
+    return result
+
+
+def _issubset(left, right):
+    """Test whether left <= right, without building their intersection."""
+    if _isskewed(len(left), len(right)):
+        return _issubset_skewed(left, right)
+
+    j, rsize = 0, len(right)
+    for inf, sup in _pairs(left):
+        # skip the intervals of right that end before the current interval
+        while j < rsize and right[j + 1] < inf:
+            j += 2
+        # the current interval must be covered by a single interval of right
+        if j == rsize or right[j] > inf or right[j + 1] < sup:
+            return False
+    return True
+
+
+def _halfopen(bounds):
+    """Return the set of half-open bounds of the closed intervals in bounds."""
+    points = set(bounds[::2])
+    points.update(map((1).__add__, bounds[1::2]))
+    return points
+
+
+def _symmetric_difference(left, right):
+    """Return the bounds of left ^ right."""
+    # The half-open bounds of left ^ right are the half-open bounds found in
+    # exactly one of the operands: a bound found in both operands is either
+    # cancelled (start or end in both), or joins adjacent intervals.
+    # The points are sorted as Python int, as the half-open bound past the
+    # greatest bound does not fit in the array of bounds.
+    points = sorted(_halfopen(left).symmetric_difference(_halfopen(right)))
+    points[1::2] = map((-1).__add__, points[1::2])  # back to closed intervals
+    return _new_bounds(points)
+
+
+def _isdisjoint(left, right):
+    """Test whether left and right have no element in common."""
+    if _isskewed(len(left), len(right)):
+        left, right = right, left
+    if _isskewed(len(right), len(left)):
+        lo, lsize = 0, len(left)
+        for inf, sup in _pairs(right):
+            lo = _gallop(left, inf, lo)
+            if lo & 1 or (lo < lsize and left[lo] <= sup):
+                return False
+        return True
+
+    i = j = 0
+    lsize, rsize = len(left), len(right)
+    while i < lsize and j < rsize:
+        if left[i + 1] < right[j]:
+            i += 2
+        elif right[j + 1] < left[i]:
+            j += 2
+        else:
+            return False
+    return True
+
+
+def _parse_bounds(string, insep, outsep):
+    """Return the bounds of the string representation of an interval set."""
+    # empty string is parsed as empty set
+    if not string:
+        return _new_bounds()
+
+    # Tokenize and validate the intervals in a single pass.  The canonical
+    # form (sorted, disjoint and non-adjacent intervals) is the common
+    # case: its bounds are used as is, and only other inputs are sorted and
+    # coalesced.
+    bounds = _new_bounds()
+    append = bounds.append
+    canonical = True
+    prev_sup = -2
+    try:
+        for itv in string.split(sep=outsep):
+            inf, sep, sup = itv.partition(insep)
+            inf = int(inf)
+            sup = int(sup) if sep else inf
+            if not 0 <= inf <= sup <= _MAX_BOUND:
+                raise ValueError
+            if inf <= prev_sup + 1:
+                canonical = False
+            prev_sup = sup
+            append(inf)
+            append(sup)
+    except ValueError:
+        raise ValueError(
+            'Invalid interval format, parsed string is: \'{}\''.format(string)
+        ) from None
+
+    if not canonical:
+        bounds = _coalesce(_pairs(bounds))
+    return bounds
+
+
+# Version of the binary format of ProcSet.to_bytes.
+_BYTES_VERSION = 1
+
+
+def _encode_varints(out, values):
+    """Append the LEB128 encoding of the non-negative values to out."""
+    append = out.append
+    for value in values:
+        while value > 0x7f:
+            append(value & 0x7f | 0x80)
+            value >>= 7
+        append(value)
+
+
+def _decode_varints(data):
+    """Return the list of the non-negative values LEB128-encoded in data."""
+    if not data or max(data) < 0x80:  # only single-byte values
+        return list(data)
+    values = []
+    append = values.append
+    value = shift = 0
+    for byte in data:
+        if byte & 0x80:
+            value |= (byte & 0x7f) << shift
+            shift += 7
+        else:
+            append(value | byte << shift)
+            value = shift = 0
+    if shift:
+        raise ValueError('Invalid ProcSet bytes: truncated data')
+    return values
+
+
+def _bits_from_bounds(bounds):
+    """Return the bitset (as an int) of the closed intervals in bounds."""
+    # The bitset is built as a string of binary digits (least significant bit
+    # first) in a single pass: shifting and or-ing an int for each interval
+    # would cost a copy of the whole bitset per interval.
+    digits = []
+    prev = 0
+    for inf, sup in _pairs(bounds):
+        digits.append('0' * (inf - prev))
+        digits.append('1' * (sup - inf + 1))
+        prev = sup + 1
+    return int(''.join(digits)[::-1] or '0', 2)
+
+
+def _bounds_from_bits(bits):
+    """Return the bounds of the runs of set bits in the bitset bits."""
+    bounds = _new_bounds()
+    for run in _re.finditer('1+', format(bits, 'b')[::-1]):
+        bounds.append(run.start())
+        bounds.append(run.end() - 1)
+    return bounds
+
+
+# Chunks of the RoaringProcSet: the processors are split into chunks of
+# _CHUNK_SIZE consecutive processors, each chunk being stored in the cheapest
+# of the following containers, as a (kind, data) pair of local processors:
+#   - _CHUNK_RUN: array('H') of the flat bounds of the intervals
+#   - _CHUNK_ARRAY: sorted array('H') of the processors
+#   - _CHUNK_BITMAP: int bitmap of the processors
+_CHUNK_SHIFT = 16
+_CHUNK_SIZE = 1 << _CHUNK_SHIFT
+_CHUNK_RUN, _CHUNK_ARRAY, _CHUNK_BITMAP = 'run', 'array', 'bitmap'
+
+
+def _chunk_pick(runs, card, bounds=None, bits=None):
+    """
+    Return the cheapest container for a non-empty chunk made of runs intervals
+    and card processors, given either as bounds or as bits.
+    """
+    # storage cost (in bytes) of the run and array containers: the bitmap
+    # container always costs _CHUNK_SIZE bits
+    run_cost, array_cost = 4 * runs, 2 * card
+    if min(run_cost, array_cost) >= _CHUNK_SIZE // 8:
+        if bits is None:
+            bits = _bits_from_bounds(bounds)
+        return (_CHUNK_BITMAP, bits)
+    if bounds is None:
+        bounds = _bounds_from_bits(bits)
+    if run_cost <= array_cost:
+        return (_CHUNK_RUN, _array.array('H', bounds))
+    return (_CHUNK_ARRAY, _array.array('H', _itertools.chain.from_iterable(
+        range(inf, sup + 1) for inf, sup in _pairs(bounds)
+    )))
+
+
+def _chunk_from_bounds(bounds):
+    """Return the cheapest container for the local bounds, or None if empty."""
+    if not bounds:
+        return None
+    runs = len(bounds) // 2
+    return _chunk_pick(runs, sum(bounds[1::2]) - sum(bounds[::2]) + runs, bounds=bounds)
+
+
+def _chunk_from_bits(bits):
+    """Return the cheapest container for the local bitmap, or None if empty."""
+    if not bits:
+        return None
+    runs = bin(bits & ~(bits << 1)).count('1')
+    return _chunk_pick(runs, bin(bits).count('1'), bits=bits)
+
+
+def _chunk_bounds(chunk):
+    """Return the local bounds of the chunk."""
+    kind, data = chunk
+    if kind is _CHUNK_RUN:
+        return _new_bounds(data)
+    if kind is _CHUNK_BITMAP:
+        return _bounds_from_bits(data)
+    bounds = _new_bounds()
+    for proc in data:
+        if bounds and bounds[-1] + 1 == proc:
+            bounds[-1] = proc
+        else:
+            bounds.append(proc)
+            bounds.append(proc)
+    return bounds
+
+
+def _chunk_bits(chunk):
+    """Return the local bitmap of the chunk."""
+    if chunk[0] is _CHUNK_BITMAP:
+        return chunk[1]
+    return _bits_from_bounds(_chunk_bounds(chunk))
+
+
+def _chunk_len(chunk):
+    """Return the number of processors in the chunk."""
+    kind, data = chunk
+    if kind is _CHUNK_RUN:
+        return sum(data[1::2]) - sum(data[::2]) + len(data) // 2
+    if kind is _CHUNK_ARRAY:
+        return len(data)
+    return bin(data).count('1')
+
+
+def _chunk_contains(chunk, proc):
+    """Check if the local processor proc is in the chunk."""
+    kind, data = chunk
+    if kind is _CHUNK_BITMAP:
+        return bool(data >> proc & 1)
+    index = _bisect.bisect_left(data, proc)
+    if kind is _CHUNK_RUN and index & 1:
         return True
+    return index < len(data) and data[index] == proc
+
 
-    __ge__ = __gt__
+def _bits_difference(left, right):
+    """Return the bitmap of left - right."""
+    return left & ~right
 
 
-class ProcSet:
+def _chunk_op(left, right, bits_op, bounds_op):
     """
-    Set of non-overlapping (i.e., disjoint) non-negative integer intervals.
+    Return the container of the set operation between two chunks, or None if
+    the result is empty.
+    """
+    # bitmaps are combined with bitwise operations, while runs and arrays are
+    # combined with the interval kernels
+    if left[0] is _CHUNK_BITMAP or right[0] is _CHUNK_BITMAP:
+        return _chunk_from_bits(bits_op(_chunk_bits(left), _chunk_bits(right)))
+    return _chunk_from_bounds(bounds_op(_chunk_bounds(left), _chunk_bounds(right)))
+
+
+def _chunks_from_bounds(bounds):
+    """Split the bounds into a dict of chunk containers, keyed by chunk."""
+    local = {}
+    for inf, sup in _pairs(bounds):
+        while inf <= sup:
+            key = inf >> _CHUNK_SHIFT
+            base = key << _CHUNK_SHIFT
+            end = min(sup, base + _CHUNK_SIZE - 1)
+            local.setdefault(key, _new_bounds()).extend((inf - base, end - base))
+            inf = end + 1
+    return {key: _chunk_from_bounds(chunk) for key, chunk in local.items()}
+
+
+def _bounds_from_chunks(chunks):
+    """Return the bounds of the processors held by the chunks."""
+    bounds = _new_bounds()
+    for key in sorted(chunks):
+        base = key << _CHUNK_SHIFT
+        for inf, sup in _pairs(_chunk_bounds(chunks[key])):
+            if bounds and bounds[-1] + 1 == base + inf:  # run across chunks
+                bounds[-1] = base + sup
+            else:
+                bounds.append(base + inf)
+                bounds.append(base + sup)
+    return bounds
+
+
+def _chunks_merge(left, right, bits_op, bounds_op, keep_left, keep_right):
+    """
+    Return the chunks of the set operation between left and right.
+
+    The chunks found in a single operand are kept as is if keep_left (resp.
+    keep_right) is set, and dropped otherwise.
+    """
+    result = {}
+    for key, chunk in left.items():
+        other = right.get(key)
+        if other is not None:
+            chunk = _chunk_op(chunk, other, bits_op, bounds_op)
+            if chunk is not None:
+                result[key] = chunk
+        elif keep_left:
+            result[key] = chunk
+    if keep_right:
+        for key, chunk in right.items():
+            if key not in left:
+                result[key] = chunk
+    return result
+
+
+# Header of the ProcSetArchive files: magic number, followed by the byte order
+# mark, the version of the format and the number of ProcSets (native int64).
+_ARCHIVE_MAGIC = b'PROCSETS'
+_ARCHIVE_VERSION = 1
+_ARCHIVE_HEADER_SIZE = 4  # in int64 items, magic number included
+
+
+# Maximum number of rendered strings cached by a ProcSet, one per format spec.
+_FORMAT_CACHE_SIZE = 4
+
+
+# ProcInt constructor bypassing the validation of the bounds, for internal use
+# on bounds that are known to be valid.
+_new_procint = _functools.partial(tuple.__new__, ProcInt)
+
+
+def _restore_procint(inf, sup):
+    """Rebuild a pickled ProcInt."""
+    return tuple.__new__(ProcInt, (inf, sup))
+
+
+def _restore_procset(cls, bounds):
+    """Rebuild a pickled ProcSet (or a subclass) from its bounds."""
+    result = cls.__new__(cls)
+    # pylint: disable=protected-access
+    result._set_bounds(bounds)
+    return result
+
+
+class _ProcSetBase:
+    """
+    Common implementation of :class:`ProcSet` and :class:`FrozenProcSet`.
+
+    This class implements all the operations that do not modify the set.
     """
 
-    __slots__ = ('_itvs', )
+    __slots__ = ('_bounds', '_len', '_ranks', '_formats')
 
     def __init__(self, *intervals):
         """
@@ -118,9 +789,242 @@ class ProcSet:
         There is no restriction on the domains of the intervals passed to the
         constructor: the domains may overlap.
         """
-        self._itvs = []  # list of disjoint intervals, in increasing order
-        for new_itvs in map(self._as_itvs, intervals):
-            self._itvs = list(self._merge(self._itvs, new_itvs, _operator.or_))
+        # flat list of the bounds of disjoint closed intervals, in increasing
+        # order: [inf_0, sup_0, inf_1, sup_1, …]
+        self._bounds = _coalesce(
+            _itertools.chain.from_iterable(map(self._as_itvs, intervals))
+        )
+        self._len = None  # cardinality, lazily computed by __len__
+        self._ranks = None  # rank index, lazily built by _rank_index
+        self._formats = None  # rendered strings, lazily cached by __format__
+
+    @classmethod
+    def from_sorted(cls, iterable, validate=True):
+        """
+        Build a ProcSet from an iterable of non-negative integers and/or
+        :class:`ProcInt`, sorted by increasing lower bound.
+
+        Runs of consecutive (or overlapping) elements are detected in a single
+        streaming pass, which makes this constructor linear in the number of
+        iterated elements.
+
+        :param iterable: \
+            sorted iterable of :class:`int` and/or :class:`ProcInt`
+        :param bool validate: \
+            whether to check the type and the ordering of the iterated elements
+            (defaults to ``True``); the caller is responsible for providing
+            valid input when set to ``False``
+        """
+        bounds = _new_bounds()
+        inf = sup = None
+        try:
+            for elem in iterable:
+                if isinstance(elem, int):
+                    if validate and elem < 0:
+                        raise ValueError('Invalid negative bound(s)')
+                    elem_inf = elem_sup = elem
+                elif validate and not isinstance(elem, ProcInt):
+                    elem_inf, elem_sup = next(cls._as_procint(elem))
+                else:
+                    elem_inf, elem_sup = elem
+
+                if sup is None:
+                    inf, sup = elem_inf, elem_sup
+                    prev_inf = inf
+                    continue
+                if validate:
+                    if elem_inf < prev_inf:
+                        raise ValueError('Unsorted iterable, expected increasing lower bounds')
+                    prev_inf = elem_inf
+
+                if elem_inf <= sup + 1:  # extend the current run
+                    if elem_sup > sup:
+                        sup = elem_sup
+                else:  # close the current run, and start a new one
+                    bounds.append(inf)
+                    bounds.append(sup)
+                    inf, sup = elem_inf, elem_sup
+            if sup is not None:
+                bounds.append(inf)
+                bounds.append(sup)
+        except OverflowError:
+            raise _bound_overflow() from None
+
+        result = cls()
+        # pylint: disable=protected-access
+        result._set_bounds(bounds)
+        return result
+
+    @classmethod
+    def from_bounds_array(cls, array):
+        """
+        Build a ProcSet from a NumPy array of shape (N, 2), whose rows are the
+        (inf, sup) bounds of closed intervals.
+        The intervals need not to be sorted nor disjoint.
+
+        :param array: \
+            array-like of integers of shape (N, 2)
+        """
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        array = numpy.asarray(array)
+        if not array.size:
+            return cls()
+        if array.ndim != 2 or array.shape[1] != 2:
+            raise ValueError('Invalid bounds array shape, expected (N, 2)')
+        if not numpy.issubdtype(array.dtype, numpy.integer):
+            raise TypeError(
+                'from_bounds_array() argument must hold int, not {}'.format(array.dtype)
+            )
+
+        if numpy.issubdtype(array.dtype, numpy.unsignedinteger) and (array > _MAX_BOUND).any():
+            raise _bound_overflow()
+        infs, sups = array[:, 0].astype(numpy.int64), array[:, 1].astype(numpy.int64)
+        if (infs > sups).any():
+            raise ValueError('Invalid interval bounds')
+        if (infs < 0).any():
+            raise ValueError('Invalid negative bound(s)')
+
+        # sort the intervals, and coalesce the overlapping or adjacent ones:
+        # a new interval starts wherever inf is past all the previous sups
+        # (infs are non-negative, so that infs - 1 cannot wrap around, while
+        # sups + 1 would for the greatest int64)
+        order = numpy.argsort(infs, kind='stable')
+        infs, sups = infs[order], numpy.maximum.accumulate(sups[order])
+        starts = numpy.flatnonzero(numpy.concatenate(([True], infs[1:] - 1 > sups[:-1])))
+        ends = numpy.concatenate((starts[1:] - 1, [infs.size - 1]))
+        bounds = numpy.column_stack((infs[starts], sups[ends]))
+
+        result = cls()
+        # pylint: disable=protected-access
+        result._set_bounds(_new_bounds(numpy.ascontiguousarray(bounds).tobytes()))
+        return result
+
+    def to_bounds_array(self):
+        """
+        Return the NumPy array of shape (N, 2) and type int64, whose rows are
+        the (inf, sup) bounds of the N disjoint intervals of the ProcSet.
+        """
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        return numpy.array(self._bounds, dtype=numpy.int64).reshape(-1, 2)
+
+    def as_memoryview(self):
+        """
+        Return a read-only :class:`memoryview` of the flat bounds
+        ``[inf_0, sup_0, inf_1, sup_1, …]`` of the intervals of the ProcSet,
+        as native int64 (format ``'q'``), without copying them.
+
+        The view shows the bounds of the ProcSet at the time of the call:
+        modifying the ProcSet afterwards does not modify the view.
+
+        .. note::
+           Read-only views of writable buffers need Python 3.8+: on older
+           versions, the returned view wraps a copy of the bounds.
+        """
+        view = memoryview(self._bounds)
+        if view.readonly:  # e.g., view of a ProcSetArchive
+            return view
+        if hasattr(view, 'toreadonly'):  # Python 3.8+
+            return view.toreadonly()
+        view.release()
+        return memoryview(self._bounds.tobytes()).cast('q')
+
+    @classmethod
+    def from_buffer(cls, buffer, validate=True):
+        """
+        Build a ProcSet wrapping the flat bounds of disjoint intervals held by
+        *buffer*, without copying them.
+
+        The bounds must be stored as native int64, in the layout returned by
+        :meth:`as_memoryview`: sorted, non-overlapping and non-adjacent closed
+        intervals.
+        The ProcSet shares the memory of *buffer*, that must not be modified
+        while the ProcSet is in use.
+        Modifying the ProcSet copies its bounds, and detaches it from *buffer*.
+
+        :param buffer: \
+            C-contiguous buffer of native int64 (such as a memoryview, an
+            ``array('q')``, or a NumPy array of int64), or of raw bytes
+        :param bool validate: \
+            whether to check that the bounds are valid (defaults to ``True``);
+            the caller is responsible for providing valid bounds when set to
+            ``False``
+        """
+        view = memoryview(buffer)
+        code = view.format.lstrip('@')
+        if not (code in ('q', 'l') and view.itemsize == 8 or code in ('B', 'b', 'c')):
+            raise TypeError(
+                'from_buffer() argument must hold native int64, not {!r}'.format(view.format)
+            )
+        view = view.cast('B').cast('q')
+        if len(view) % 2:
+            raise ValueError('Invalid bounds buffer: odd number of bounds')
+        if validate and view and not (
+                view[0] >= 0
+                and all(map(_operator.le, view[::2], view[1::2]))
+                and all(map(_operator.lt, map((1).__add__, view[1::2]), view[2::2]))
+        ):
+            raise ValueError('Invalid bounds buffer: unsorted or overlapping intervals')
+        return _restore_procset(cls, view)
+
+    def to_bytes(self):
+        """
+        Return the compact binary representation of the ProcSet.
+
+        The intervals are delta-encoded: each interval is stored as its gap
+        from the previous interval and its length, both packed as LEB128
+        variable-length integers.
+        """
+        out = bytearray((_BYTES_VERSION, ))
+        _encode_varints(out, (len(self._bounds) // 2, ))
+        # the gap of an interval is the distance of its inf bound to the lowest
+        # possible one: 0 for the first interval, and the previous sup bound
+        # plus 2 for the others (the intervals of a ProcSet are not adjacent)
+        bounds = self._bounds
+        lowest = _itertools.chain((0, ), map((2).__add__, bounds[1::2]))
+        gaps = map(_operator.sub, bounds[::2], lowest)
+        lengths = map(_operator.sub, bounds[1::2], bounds[::2])
+        _encode_varints(out, _itertools.chain.from_iterable(zip(gaps, lengths)))
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Build a ProcSet from its binary representation, as returned by
+        :meth:`to_bytes`.
+
+        :param data: \
+            bytes-like object to decode
+        """
+        if isinstance(data, str):
+            raise TypeError('from_bytes() argument 2 must be bytes-like, not str')
+        data = memoryview(data).cast('B')
+        if not data or data[0] != _BYTES_VERSION:
+            raise ValueError(
+                'Unsupported ProcSet bytes format version: {}'.format(
+                    data[0] if data else None
+                )
+            )
+
+        # the number of intervals is decoded apart, so that the single-byte
+        # fast path of _decode_varints applies to the deltas
+        end = 1
+        while end < len(data) and data[end] & 0x80:
+            end += 1
+        count = _decode_varints(data[1:end + 1])
+        deltas = _decode_varints(data[end + 1:])
+        if not count or len(deltas) != 2 * count[0]:
+            raise ValueError('Invalid ProcSet bytes: mismatching number of intervals')
+        # undo the delta encoding: the bounds are the cumulative sums of the
+        # gaps (back to the distance to the previous sup bound) and lengths
+        deltas[2::2] = map((2).__add__, deltas[2::2])
+        bounds = _new_bounds(_itertools.accumulate(deltas))
+
+        result = cls()
+        # pylint: disable=protected-access
+        result._set_bounds(bounds)
+        return result
 
     @classmethod
     def from_str(cls, string, insep="-", outsep=" "):
@@ -142,26 +1046,88 @@ class ProcSet:
                 'from_str() argument 2 must be str, not {}'.format(type(string).__name__)
             )
 
-        # empty string is parsed as empty ProcSet
-        if not string:
-            return cls()
+        result = cls()
+        # pylint: disable=protected-access
+        result._set_bounds(_parse_bounds(string, insep, outsep))
+        return result
 
-        try:
-            raw_bounds = (
-                map(int, itv.split(sep=insep, maxsplit=1))
-                for itv in string.split(sep=outsep)
-            )
-            intervals = (ProcInt(*bounds) for bounds in raw_bounds)
-            return cls(*intervals)
-        except ValueError:
-            raise ValueError(
-                'Invalid interval format, parsed string is: \'{}\''.format(string)
-            ) from None
+    @staticmethod
+    def _iter_lines_bounds(lines, insep, outsep):
+        """Yield the bounds parsed from each line of lines."""
+        for line in lines:
+            if not isinstance(line, str):
+                raise TypeError('lines must hold str, not {}'.format(type(line).__name__))
+            yield _parse_bounds(line.rstrip('\r\n'), insep, outsep)
+
+    @classmethod
+    def iter_from_lines(cls, lines, insep="-", outsep=" "):
+        """
+        Lazily build a ProcSet from each string representation of an interval
+        set in *lines*, as :meth:`from_str` would.
+
+        Lines are parsed one at a time, so that only the current line is held
+        in memory.
+        Trailing newline characters are ignored, and empty lines are parsed as
+        empty ProcSet.
+
+        :param lines: \
+            iterable of :class:`str`, such as a text file opened for reading
+        :param str insep: \
+            delimiter character between the boundaries of a single interval
+            (defaults to ``-``, ascii dash symbol ``0x2d``)
+        :param str outsep: \
+            delimiter character between two intervals
+            (defaults to ``␣``, ascii space symbol ``0x20``)
+        """
+        for bounds in cls._iter_lines_bounds(lines, insep, outsep):
+            result = cls()
+            # pylint: disable=protected-access
+            result._set_bounds(bounds)
+            yield result
+
+    @classmethod
+    def from_lines(cls, lines, insep="-", outsep=" "):
+        """
+        Build the ProcSet union of the string representations of interval sets
+        in *lines*.
+
+        Lines are parsed one at a time, and merged into the result in batches,
+        so that the memory footprint stays proportional to the size of the
+        result.
+        See :meth:`iter_from_lines` for the description of the parameters.
+        """
+        union, pending, pending_size = _new_bounds(), [], 0
+        for bounds in cls._iter_lines_bounds(lines, insep, outsep):
+            pending.append(bounds)
+            pending_size += len(bounds)
+            # merge the pending bounds once they outweigh the union: the cost
+            # of each merge is then amortized over the lines it merges
+            if pending_size >= len(union):
+                union = _union(union, _coalesce(
+                    _itertools.chain.from_iterable(map(_pairs, pending))
+                ))
+                pending, pending_size = [], 0
+        if pending:
+            union = _union(union, _coalesce(_itertools.chain.from_iterable(map(_pairs, pending))))
+
+        result = cls()
+        # pylint: disable=protected-access
+        result._set_bounds(union)
+        return result
 
     def __str__(self):
         return format(self)
 
     def __format__(self, format_spec):
+        # The strings rendered for the most recently used format specs are
+        # cached until the ProcSet is modified.
+        formats = self._formats
+        if formats is None:
+            formats = self._formats = _collections.OrderedDict()
+        elif format_spec in formats:
+            formats.move_to_end(format_spec)
+            return formats[format_spec]
+
         if format_spec:
             try:
                 insep, outsep = format_spec
@@ -170,84 +1136,151 @@ class ProcSet:
         else:
             insep, outsep = '- '
 
-        return outsep.join(format(itv, insep) for itv in self._itvs)
+        string = outsep.join(
+            str(inf) if inf == sup else '{}{}{}'.format(inf, insep, sup)
+            for inf, sup in _pairs(self._bounds)
+        )
+        if len(formats) == _FORMAT_CACHE_SIZE:
+            formats.popitem(last=False)  # evict the least recently used
+        formats[format_spec] = string
+        return string
 
     def __repr__(self):
-        compact = lambda itv: str(tuple(itv)) if len(itv) > 1 else str(itv.inf)
-        args = (compact(itv) for itv in self._itvs)
+        args = (
+            str(inf) if inf == sup else str((inf, sup))
+            for inf, sup in _pairs(self._bounds)
+        )
         return '{}({})'.format(type(self).__name__, ', '.join(args))
 
     def __iter__(self):
         """Iterate over the processors in the ProcSet by increasing order."""
-        # as self._itvs is sorted by increasing order, we can directly yield
-        for itv in self._itvs:
-            yield from range(itv.inf, itv.sup + 1)
+        # as self._bounds is sorted by increasing order, we can directly yield
+        for inf, sup in _pairs(self._bounds):
+            yield from range(inf, sup + 1)
 
     def __reversed__(self):
         """Iterate over the processors in the ProcSet by decreasing order."""
-        # as self._itvs is sorted in increasing order, we yield from the
+        # as self._bounds is sorted in increasing order, we yield from the
         # reversed iterator
-        for itv in reversed(self._itvs):
-            yield from reversed(range(itv.inf, itv.sup + 1))
+        for sup, inf in _pairs(reversed(self._bounds)):
+            yield from range(sup, inf - 1, -1)
 
     def iter_slice(self, start=None, stop=None, step=None):
         """
         Iterate over the processors in the ProcSet from *start* (included) to
         *stop* (excluded) by steps of *step*.
         """
-        cur, stop, step = slice(start, stop, step).indices(len(self))
-        if step > 0:
-            for itv in self._itvs:
-                if stop <= cur:  # early termination: no more matching items
-                    break
-                while cur < len(itv) and cur < stop:  # exhaust current itv
-                    yield itv.inf + cur
-                    cur += step
-                # switch to new itv
-                cur -= len(itv)
-                stop -= len(itv)
-        else:
-            # work from end when step is negative
-            cur -= len(self)
-            stop -= len(self)
-            for itv in reversed(self._itvs):
-                if stop >= cur:  # early termination: no more matching items
-                    break
-                # account for current itv shift
-                cur += len(itv)
-                stop += len(itv)
-                while cur >= 0 and cur > stop:  # exhaust current itv
-                    yield itv.inf + cur
-                    cur += step  # step is negative
+        positions = range(*slice(start, stop, step).indices(len(self)))
+        if not positions:
+            return
+        bounds, ranks = self._bounds, self._rank_index()
+        index = 0
+        for pos in positions:
+            # jump to the interval holding pos, unless it is the current one
+            if not ranks[index] <= pos < ranks[index + 1]:
+                index = _bisect.bisect_right(ranks, pos) - 1
+            yield bounds[2 * index] + pos - ranks[index]
 
     def __contains__(self, item):
         """Check if item is in the ProcSet."""
-        if self._itvs:
-            low, high = 0, len(self._itvs)
-            while low < high:
-                mid = (low + high) // 2
-                if item in self._itvs[mid]:
-                    return True
-                elif item < self._itvs[mid].inf:
-                    high = mid
-                else:
-                    low = mid + 1
-        return False
+        # item is in the ProcSet iff it lies in between an inf bound (even
+        # index) and the matching sup bound (odd index)
+        index = _bisect.bisect_left(self._bounds, item)
+        if index & 1:
+            return True
+        return index < len(self._bounds) and self._bounds[index] == item
+
+    def contains_many(self, items, subset=False):
+        """
+        Check which of the processors in *items* are in the ProcSet.
+
+        Return the list of booleans telling whether each processor of *items*
+        is in the ProcSet, or the list of the processors of *items* that are in
+        the ProcSet if *subset* is ``True``.
+        If *items* is a NumPy array, the result is a NumPy array as well.
+
+        :param items: \
+            iterable of processors to look for
+        :param bool subset: \
+            whether to return the matching processors rather than a mask
+            (defaults to ``False``)
+        """
+        numpy = _sys.modules.get('numpy')
+        if numpy is not None and isinstance(items, numpy.ndarray):
+            return self._contains_many_numpy(numpy, items, subset)
+
+        bounds = self._bounds
+        result = []
+        index, prev = 0, None
+        for item in items:
+            # Walk forward from the previous position as long as the items are
+            # sorted, and fall back to a plain bisection otherwise.
+            if prev is not None and item >= prev:
+                index = _gallop(bounds, item, index, right=True)
+            else:
+                index = _bisect.bisect_right(bounds, item)
+            prev = item
+            # item lies in between an inf bound, and the matching sup bound
+            found = bool(index & 1) or (index > 0 and bounds[index - 1] == item)
+            if not subset:
+                result.append(found)
+            elif found:
+                result.append(item)
+        return result
+
+    def _contains_many_numpy(self, numpy, items, subset):
+        """Vectorized version of contains_many for NumPy arrays."""
+        bounds = numpy.frombuffer(self._bounds, dtype=numpy.int64)
+        index = numpy.searchsorted(bounds, items, side='right')
+        mask = (index & 1).astype(bool)
+        if bounds.size:
+            mask |= (index > 0) & (bounds[numpy.maximum(index - 1, 0)] == items)
+        if subset:
+            return items[mask]
+        return mask
 
     def __eq__(self, other):
+        if not isinstance(other, _ProcSetBase):
+            return NotImplemented
         # pylint: disable=protected-access
-        return self._itvs == other._itvs
+        return self._bounds == other._bounds
 
     def __bool__(self):
-        return bool(self._itvs)
+        return bool(self._bounds)
 
     def __len__(self):
         """Return the number of processors contained in the ProcSet."""
-        return sum(len(itv) for itv in self._itvs)
+        if self._len is None:
+            bounds = self._bounds
+            self._len = sum(bounds[1::2]) - sum(bounds[::2]) + len(bounds) // 2
+        return self._len
+
+    def _set_bounds(self, bounds):
+        """Replace the bounds of the ProcSet, and invalidate the cached state."""
+        self._bounds = bounds
+        self._len = None
+        self._ranks = None
+        self._formats = None
+
+    def _rank_index(self):
+        """
+        Return the rank index of the ProcSet, building it if needed.
+
+        The rank index is the array of the cumulative lengths of the intervals:
+        the i-th interval holds the processors of ranks ``index[i]`` (included)
+        to ``index[i + 1]`` (excluded).
+        """
+        if self._ranks is None:
+            bounds = self._bounds
+            lengths = map((1).__add__, map(_operator.sub, bounds[1::2], bounds[::2]))
+            ranks = _itertools.accumulate(_itertools.chain((0, ), lengths))
+            self._ranks = _new_bounds(ranks)
+            self._len = self._ranks[-1]
+        return self._ranks
 
     def count(self):
         """Return the number of disjoint intervals in the ProcSet."""
-        return len(self._itvs)
+        return len(self._bounds) // 2
 
     def iscontiguous(self):
         """Return ``True`` if the ProcSet is made of a unique interval."""
@@ -257,7 +1290,10 @@ class ProcSet:
         """
         Return ``True`` if the ProcSet has no processor in common with *other*.
         """
-        if not isinstance(other, type(self)):
+        if isinstance(other, (BitmapProcSet, RoaringProcSet)):
+            # the ProcSet is converted, rather than the (big) bitmap or chunks
+            return other.isdisjoint(self)
+        if not isinstance(other, _ProcSetBase):
             try:
                 other = type(self)(*other)
             except TypeError:
@@ -265,18 +1301,24 @@ class ProcSet:
 
         # A naive implementation would test the truthiness of the intersection
         # set.  However, one does not care about the intersection set.  It is
-        # sufficient to test if the generator returned by _merge is empty.
-        _sentinel = object()
+        # sufficient to find the first overlapping intervals.
         # pylint: disable=protected-access
-        _first = next(self._merge(self._itvs, other._itvs, _operator.and_), _sentinel)
-        return _first is _sentinel
+        return _isdisjoint(self._bounds, other._bounds)
 
     def _issubset(self, other):
-        return self & other == self
+        # pylint: disable=protected-access
+        # The cardinalities are only compared when both are cached: computing
+        # the length of the bigger operand is linear in its number of
+        # intervals, while the galloping sweep is not.
+        if self._len is not None and other._len is not None and self._len > other._len:
+            return False
+        return _issubset(self._bounds, other._bounds)
 
     def issubset(self, other):
         """Test whether every element in the ProcSet is in *other*."""
-        if not isinstance(other, type(self)):
+        if isinstance(other, (BitmapProcSet, RoaringProcSet)):
+            return other.issuperset(self)
+        if not isinstance(other, _ProcSetBase):
             try:
                 other = type(self)(*other)
             except TypeError:
@@ -285,7 +1327,7 @@ class ProcSet:
 
     def __le__(self, other):
         """Test whether every element in the ProcSet is in *other*."""
-        if not isinstance(other, type(self)):
+        if not isinstance(other, _ProcSetBase):
             return NotImplemented
         return self._issubset(other)
 
@@ -294,13 +1336,16 @@ class ProcSet:
         Test whether the ProcSet is a proper subset of *other*, that is
         ``self <= other`` and ``self != other``.
         """
-        if not isinstance(other, type(self)):
+        if not isinstance(other, _ProcSetBase):
             return NotImplemented
-        return self._issubset(other) and self != other
+        # pylint: disable=protected-access
+        return self._issubset(other) and self._bounds != other._bounds
 
     def issuperset(self, other):
         """Test whether every element in *other* is in the ProcSet."""
-        if not isinstance(other, type(self)):
+        if isinstance(other, (BitmapProcSet, RoaringProcSet)):
+            return other.issubset(self)
+        if not isinstance(other, _ProcSetBase):
             try:
                 other = type(self)(*other)
             except TypeError:
@@ -310,7 +1355,7 @@ class ProcSet:
 
     def __ge__(self, other):
         """Test whether every element in *other* is in the ProcSet."""
-        if not isinstance(other, type(self)):
+        if not isinstance(other, _ProcSetBase):
             return NotImplemented
         # pylint: disable=protected-access
         return other._issubset(self)
@@ -320,93 +1365,30 @@ class ProcSet:
         Test whether the ProcSet is a proper superset of *other*, that is
         ``self >= other`` and ``self != other``.
         """
-        if not isinstance(other, type(self)):
+        if not isinstance(other, _ProcSetBase):
             return NotImplemented
         # pylint: disable=protected-access
-        return other._issubset(self) and self != other
-
-    @staticmethod
-    def _flatten(itvs):
-        """Generate the (flat) list of interval bounds contained in itvs."""
-        for itv in itvs:
-            # use inf as is
-            yield False, itv.inf
-            # convert sup, as merging operations are made with half-open
-            # intervals
-            yield True, itv.sup + 1
-
-    @classmethod
-    def _merge_core(cls, left_itvs, right_itvs, keeppredicate):
-        """
-        Generate the (flat) list of interval bounds of the requested merge.
-
-        The implementation is inspired by https://stackoverflow.com/a/20062829.
-        """
-        endbound = False
-        sentinel = _Sentinel()
-
-        # pylint: disable=protected-access
-        lflat = cls._flatten(left_itvs)
-        rflat = cls._flatten(right_itvs)
-        lend, lhead = next(lflat, (False, sentinel))
-        rend, rhead = next(rflat, (False, sentinel))
-
-        head = min(lhead, rhead)
-        while head < sentinel:
-            inleft = (head < lhead) == lend
-            inright = (head < rhead) == rend
-            keep = keeppredicate(inleft, inright)
-
-            if keep ^ endbound:
-                endbound = not endbound
-                yield head
-            if head == lhead:
-                lend, lhead = next(lflat, (False, sentinel))
-            if head == rhead:
-                rend, rhead = next(rflat, (False, sentinel))
-
-            head = min(lhead, rhead)
-
-    @classmethod
-    def _merge(cls, left_itvs, right_itvs, keeppredicate):
-        """
-        Generate the ProcInt list of the requested merge.
-
-        The returned iterator is supposed to be assigned to the _itvs attribute
-        of the result ProcSet.
-        See the difference(), intersection(), symmetric_difference(), and
-        union() methods for an usage example.
-        """
-        flat_merge = cls._merge_core(left_itvs, right_itvs, keeppredicate)
-
-        # Note that we are feeding the same iterable twice to zip.
-        # The iterated bounds are hence grouped by pairs (lower and upper
-        # bounds of the intervals).
-        # As zip() stops on the shortest iterable, it won't consider the
-        # optional terminating sentinel (the sentinel would be the last
-        # element, and would have an odd index).
-        for inf, sup in zip(flat_merge, flat_merge):
-            yield ProcInt(inf, sup - 1)  # convert back to closed intervals
+        return other._issubset(self) and self._bounds != other._bounds
 
     def union(self, *others):
         """Return a new ProcSet with elements from the ProcSet and all others."""
-        result = self.copy()
-        for other in map(self._as_itvs, others):
-            # pylint: disable=protected-access
-            result._itvs = list(result._merge(result._itvs, other, _operator.or_))
+        result = type(self)()
+        # pylint: disable=protected-access
+        itvs = _itertools.chain(_pairs(self._bounds), *map(self._as_itvs, others))
+        result._set_bounds(_coalesce(itvs))
         return result
 
     def __or__(self, other):
         """Return a new ProcSet with elements from the ProcSet and *other*."""
-        if not isinstance(other, type(self)):
+        if not isinstance(other, (_ProcSetBase, BitmapProcSet, RoaringProcSet)):
             return NotImplemented
 
-        # We directly assign result._itvs as self._merge(…) returns a valid
-        # _itvs list. This is the same as ProcSet(*self._merge(…)), minus the
-        # input validation step.
+        # We directly assign result._bounds as the merge kernels return valid
+        # _bounds. This is the same as building a ProcSet from the merged
+        # intervals, minus the input validation step.
         result = type(self)()
         # pylint: disable=protected-access
-        result._itvs = list(self._merge(self._itvs, other._itvs, _operator.or_))
+        result._set_bounds(_union(self._bounds, self._as_bounds(other)))
         return result
 
     def intersection(self, *others):
@@ -414,57 +1396,50 @@ class ProcSet:
         Return a new ProcSet with elements common to the ProcSet and all
         others.
         """
-        result = self.copy()
-        for other in map(self._as_itvs, others):
-            # pylint: disable=protected-access
-            result._itvs = list(result._merge(result._itvs, other, _operator.and_))
+        result = type(self)()
+        # pylint: disable=protected-access
+        result._set_bounds(_intersection_many(self._bounds, *map(self._as_bounds, others)))
         return result
 
     def __and__(self, other):
         """
         Return a new ProcSet with elements common to the ProcSet and *other*.
         """
-        if not isinstance(other, type(self)):
+        if not isinstance(other, (_ProcSetBase, BitmapProcSet, RoaringProcSet)):
             return NotImplemented
 
-        # We directly assign result._itvs as self._merge(…) returns a valid
-        # _itvs list. This is the same as ProcSet(*self._merge(…)), minus the
-        # input validation step.
+        # We directly assign result._bounds as the merge kernels return valid
+        # _bounds. This is the same as building a ProcSet from the merged
+        # intervals, minus the input validation step.
         result = type(self)()
         # pylint: disable=protected-access
-        result._itvs = list(self._merge(self._itvs, other._itvs, _operator.and_))
+        result._set_bounds(_intersection(self._bounds, self._as_bounds(other)))
         return result
 
-    @staticmethod
-    def _difference_operator(inleft, inright):
-        return inleft and not inright
-
     def difference(self, *others):
         """
         Return a new ProcSet with elements in the ProcSet that are not in the
         others.
         """
-        result = self.copy()
-        for other in map(self._as_itvs, others):
-            # pylint: disable=protected-access
-            result._itvs = list(result._merge(result._itvs, other, self._difference_operator))
+        result = type(self)()
+        # pylint: disable=protected-access
+        removed = _coalesce(_itertools.chain.from_iterable(map(self._as_itvs, others)))
+        result._set_bounds(_difference(self._bounds, removed))
         return result
 
     def __sub__(self, other):
         """
         Return a new ProcSet with elements in the ProcSet that are not in *other*.
         """
-        if not isinstance(other, type(self)):
+        if not isinstance(other, (_ProcSetBase, BitmapProcSet, RoaringProcSet)):
             return NotImplemented
 
-        # We directly assign result._itvs as self._merge(…) returns a valid
-        # _itvs list. This is the same as ProcSet(*self._merge(…)), minus the
-        # input validation step.
+        # We directly assign result._bounds as the merge kernels return valid
+        # _bounds. This is the same as building a ProcSet from the merged
+        # intervals, minus the input validation step.
         result = type(self)()
         # pylint: disable=protected-access
-        result._itvs = list(
-            self._merge(self._itvs, other._itvs, self._difference_operator)
-        )
+        result._set_bounds(_difference(self._bounds, self._as_bounds(other)))
         return result
 
     def symmetric_difference(self, other):
@@ -474,7 +1449,7 @@ class ProcSet:
         """
         result = type(self)()
         # pylint: disable=protected-access
-        result._itvs = list(result._merge(self._itvs, self._as_itvs(other), _operator.xor))
+        result._set_bounds(_symmetric_difference(self._bounds, self._as_bounds(other)))
         return result
 
     def __xor__(self, other):
@@ -482,29 +1457,30 @@ class ProcSet:
         Return a new ProcSet with elements in either the ProcSet or *other*,
         but not in both.
         """
-        if not isinstance(other, type(self)):
+        if not isinstance(other, (_ProcSetBase, BitmapProcSet, RoaringProcSet)):
             return NotImplemented
 
-        # We directly assign result._itvs as self._merge(…) returns a valid
-        # _itvs list. This is the same as ProcSet(*self._merge(…)), minus the
-        # input validation step.
+        # We directly assign result._bounds as the merge kernels return valid
+        # _bounds. This is the same as building a ProcSet from the merged
+        # intervals, minus the input validation step.
         result = type(self)()
         # pylint: disable=protected-access
-        result._itvs = list(self._merge(self._itvs, other._itvs, _operator.xor))
+        result._set_bounds(_symmetric_difference(self._bounds, self._as_bounds(other)))
         return result
 
     def copy(self):
         """Return a new ProcSet with a shallow copy of the ProcSet."""
-        # We directly assign result._itvs as self._itvs is a valid list.  Note
-        # that a ProcSet is nothing more than a container with some extra
+        # We directly assign result._bounds as self._bounds is a valid array.
+        # Note that a ProcSet is nothing more than a container with some extra
         # methods, and a given structure.  As the current implementation relies
-        # on the _itvs list, copying a ProcSet is the same as copying the _itvs
-        # list.  Hence, we need to ensure a new _itvs list is created (and not
-        # just a reference to self._itvs).  As _itvs is a list of ProcInt, a
-        # shallow copy is the same as a deep copy.
+        # on the _bounds array, copying a ProcSet is the same as copying the
+        # _bounds array.  Hence, we need to ensure a new _bounds array is
+        # created (and not just a reference to self._bounds).  As _bounds is
+        # an array of int, a shallow copy is the same as a deep copy.
         result = type(self)()
         # pylint: disable=protected-access
-        result._itvs = self._itvs.copy()
+        result._set_bounds(_new_bounds(self._bounds))
+        result._len = self._len
         return result
 
     __copy__ = copy  # ensure compatibility with standard module copy
@@ -512,104 +1488,35 @@ class ProcSet:
     def __deepcopy__(self, memo):
         # Optimized version of __deepcopy__ for ProcSet.
         # /!\ This optimization is implementation specific /!\
-        # The classic __deepcopy__ implementation can be bypassed because a
-        # ProcInt is an immutable structure: there is no need to use the
-        # generic and complex implementation of deepcopy for tuples that may
-        # contain mutables.
+        # The classic __deepcopy__ implementation can be bypassed because the
+        # _bounds array only holds immutable int: there is no need to use the
+        # generic and complex implementation of deepcopy.
         return self.copy()
 
-    def update(self, *others):
-        """Update the ProcSet, adding elements from all others."""
-        for other in map(self._as_itvs, others):
-            self._itvs = list(self._merge(self._itvs, other, _operator.or_))
-        return self
-
-    insert = update  # backward compatibility alias
-
-    def __ior__(self, other):
-        """Update the ProcSet, adding elements from *other*."""
-        if not isinstance(other, type(self)):
-            return NotImplemented
-
-        # pylint: disable=protected-access
-        self._itvs = list(self._merge(self._itvs, other._itvs, _operator.or_))
-        return self
-
-    def intersection_update(self, *others):
-        """
-        Update the ProcSet, keeping only elements found in the ProcSet and all
-        others.
-        """
-        for other in map(self._as_itvs, others):
-            self._itvs = list(self._merge(self._itvs, other, _operator.and_))
-        return self
-
-    def __iand__(self, other):
-        """
-        Update the ProcSet, keeping only elements found in the ProcSet and *other*.
-        """
-        if not isinstance(other, type(self)):
-            return NotImplemented
-
-        # pylint: disable=protected-access
-        self._itvs = list(self._merge(self._itvs, other._itvs, _operator.and_))
-        return self
-
-    def difference_update(self, *others):
-        """Update the ProcSet, removing elements found in others."""
-        for other in map(self._as_itvs, others):
-            self._itvs = list(self._merge(self._itvs, other, self._difference_operator))
-        return self
-
-    discard = difference_update  # convenience alias
-
-    def __isub__(self, other):
-        """Update the ProcSet, removing elements found in *other*."""
-        if not isinstance(other, type(self)):
-            return NotImplemented
-
-        # pylint: disable=protected-access
-        self._itvs = list(self._merge(self._itvs, other._itvs, self._difference_operator))
-        return self
-
-    def symmetric_difference_update(self, other):
-        """
-        Update the ProcSet, keeping only elements found in either the ProcSet
-        or *other*, but not in both.
-        """
-        self._itvs = list(self._merge(self._itvs, self._as_itvs(other), _operator.xor))
-        return self
-
-    def __ixor__(self, other):
-        """
-        Update the ProcSet, keeping only elements found in either the ProcSet
-        or *other*, but not in both.
-        """
-        if not isinstance(other, type(self)):
-            return NotImplemented
-
-        # pylint: disable=protected-access
-        self._itvs = list(self._merge(self._itvs, other._itvs, _operator.xor))
-        return self
-
-    def clear(self):
-        """Empty the ProcSet, removing all elements from it."""
-        self._itvs = []
+    def __reduce__(self):
+        # A ProcSet is pickled as its flat array of bounds, which is itself
+        # pickled as raw bytes.  The cached state is left out, and the bounds
+        # are not validated again when unpickled.
+        bounds = self._bounds
+        if not isinstance(bounds, _array.array):  # view of a ProcSetArchive
+            bounds = _new_bounds(bounds.tobytes())
+        return (_restore_procset, (type(self), bounds))
+
+    def __setstate__(self, state):
+        # Only ProcSets pickled by procset 1.0 have a state: their slot
+        # _itvs held the sorted list of their disjoint ProcInt.
+        _, slots = state
+        self._set_bounds(_new_bounds(_itertools.chain.from_iterable(slots['_itvs'])))
 
     def __getitem_int(self, index):
         assert isinstance(index, int)
-        cur = index
-        if cur >= 0:
-            for itv in self._itvs:
-                if cur < len(itv):
-                    return itv.inf + cur
-                cur -= len(itv)
-        else:
-            for itv in reversed(self._itvs):
-                if cur >= -len(itv):
-                    return itv.sup + 1 + cur
-                cur += len(itv)
-        raise IndexError('{} index out of range'.format(type(self).__name__))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('{} index out of range'.format(type(self).__name__))
+        ranks = self._rank_index()
+        itv = _bisect.bisect_right(ranks, index) - 1
+        return self._bounds[2 * itv] + index - ranks[itv]
 
     def __getitem__(self, index):
         if isinstance(index, int):
@@ -638,7 +1545,7 @@ class ProcSet:
         of the smallest unique interval containing all intervals from the
         non-empty ProcSet.
         """
-        if self._itvs:
+        if self._bounds:
             return type(self)(ProcInt(self.min, self.max))
         return type(self)()
 
@@ -646,13 +1553,14 @@ class ProcSet:
         """
         Return an iterator over the intervals of the ProcSet in increasing order.
         """
-        return iter(self._itvs)
+        # ProcInt are built lazily from the flat list of bounds
+        return map(_new_procint, _pairs(self._bounds))
 
     @property
     def min(self):
         """The first processor in the ProcSet (in increasing order)."""
         try:
-            return self._itvs[0].inf
+            return self._bounds[0]
         except IndexError:
             raise ValueError('Empty ProcSet') from None
 
@@ -660,7 +1568,7 @@ class ProcSet:
     def max(self):
         """The last processor in the ProcSet (in increasing order)."""
         try:
-            return self._itvs[-1].sup
+            return self._bounds[-1]
         except IndexError:
             raise ValueError('Empty ProcSet') from None
 
@@ -680,9 +1588,1562 @@ class ProcSet:
 
     @classmethod
     def _as_itvs(cls, other):
-        """Iterate over other as an _itvs list."""
-        if isinstance(other, cls):
+        """Iterate over other as (inf, sup) pairs of disjoint intervals."""
+        if isinstance(other, _ProcSetBase):
             # pylint: disable=protected-access
-            yield from other._itvs
-        else:
-            yield from cls._as_procint(other)
+            return _pairs(other._bounds)
+        if isinstance(other, (BitmapProcSet, RoaringProcSet)):
+            # pylint: disable=protected-access
+            return _pairs(other._to_bounds())
+        return cls._as_procint(other)
+
+    @classmethod
+    def _as_bounds(cls, other):
+        """Return other as a _bounds list."""
+        if isinstance(other, _ProcSetBase):
+            # pylint: disable=protected-access
+            return other._bounds
+        if isinstance(other, (BitmapProcSet, RoaringProcSet)):
+            # pylint: disable=protected-access
+            return other._to_bounds()
+        return _new_bounds(next(cls._as_procint(other)))
+
+
+class ProcSet(_ProcSetBase):
+    """
+    Set of non-overlapping (i.e., disjoint) non-negative integer intervals.
+    """
+
+    __slots__ = ()
+
+    def update(self, *others):
+        """Update the ProcSet, adding elements from all others."""
+        added = _coalesce(_itertools.chain.from_iterable(map(self._as_itvs, others)))
+        self._union_update(added)
+        return self
+
+    insert = update  # backward compatibility alias
+
+    def __ior__(self, other):
+        """Update the ProcSet, adding elements from *other*."""
+        if not isinstance(other, (_ProcSetBase, BitmapProcSet, RoaringProcSet)):
+            return NotImplemented
+
+        # pylint: disable=protected-access
+        self._union_update(self._as_bounds(other))
+        return self
+
+    def intersection_update(self, *others):
+        """
+        Update the ProcSet, keeping only elements found in the ProcSet and all
+        others.
+        """
+        self._set_bounds(_intersection_many(self._bounds, *map(self._as_bounds, others)))
+        return self
+
+    def __iand__(self, other):
+        """
+        Update the ProcSet, keeping only elements found in the ProcSet and *other*.
+        """
+        if not isinstance(other, (_ProcSetBase, BitmapProcSet, RoaringProcSet)):
+            return NotImplemented
+
+        # pylint: disable=protected-access
+        self._set_bounds(_intersection(self._bounds, self._as_bounds(other)))
+        return self
+
+    def difference_update(self, *others):
+        """Update the ProcSet, removing elements found in others."""
+        removed = _coalesce(_itertools.chain.from_iterable(map(self._as_itvs, others)))
+        self._difference_update(removed)
+        return self
+
+    discard = difference_update  # convenience alias
+
+    def __isub__(self, other):
+        """Update the ProcSet, removing elements found in *other*."""
+        if not isinstance(other, (_ProcSetBase, BitmapProcSet, RoaringProcSet)):
+            return NotImplemented
+
+        # pylint: disable=protected-access
+        self._difference_update(self._as_bounds(other))
+        return self
+
+    def symmetric_difference_update(self, other):
+        """
+        Update the ProcSet, keeping only elements found in either the ProcSet
+        or *other*, but not in both.
+        """
+        self._set_bounds(_symmetric_difference(self._bounds, self._as_bounds(other)))
+        return self
+
+    def __ixor__(self, other):
+        """
+        Update the ProcSet, keeping only elements found in either the ProcSet
+        or *other*, but not in both.
+        """
+        if not isinstance(other, (_ProcSetBase, BitmapProcSet, RoaringProcSet)):
+            return NotImplemented
+
+        # pylint: disable=protected-access
+        self._set_bounds(_symmetric_difference(self._bounds, self._as_bounds(other)))
+        return self
+
+    def _union_update(self, added):
+        """Add the intervals of the added bounds to the ProcSet."""
+        if _isskewed(len(added), len(self._bounds)) and _isresizable(self._bounds):
+            # small delta: only splice the affected regions of the bounds
+            _union_splice(self._bounds, added)
+            self._set_bounds(self._bounds)
+        else:
+            self._set_bounds(_union(self._bounds, added))
+
+    def _difference_update(self, removed):
+        """Remove the intervals of the removed bounds from the ProcSet."""
+        if _isskewed(len(removed), len(self._bounds)) and _isresizable(self._bounds):
+            # small delta: only splice the affected regions of the bounds
+            _difference_splice(self._bounds, removed)
+            self._set_bounds(self._bounds)
+        else:
+            self._set_bounds(_difference(self._bounds, removed))
+
+    def clear(self):
+        """Empty the ProcSet, removing all elements from it."""
+        self._set_bounds(_new_bounds())
+
+
+class FrozenProcSet(_ProcSetBase):
+    """
+    Immutable and hashable counterpart of :class:`ProcSet`.
+    """
+
+    __slots__ = ('_hash', )
+
+    def __init__(self, *intervals):
+        """
+        A FrozenProcSet is initialized with the same arguments as a
+        :class:`ProcSet`.
+        """
+        super().__init__(*intervals)
+        self._hash = None  # lazily computed by __hash__
+
+    def _set_bounds(self, bounds):
+        super()._set_bounds(bounds)
+        self._hash = None
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self._bounds.tobytes())
+        return self._hash
+
+    def __eq__(self, other):
+        # Comparing the numbers of intervals, and the hashes if both are
+        # already cached, is cheaper than comparing the bounds.  The hashes
+        # are not computed here, as hashing copies the bounds.
+        # pylint: disable=protected-access
+        if isinstance(other, FrozenProcSet):
+            if self.count() != other.count():
+                return False
+            if self._hash is not None and other._hash is not None and self._hash != other._hash:
+                return False
+        return super().__eq__(other)
+
+    def copy(self):
+        """Return the FrozenProcSet itself, as it is immutable."""
+        return self
+
+    __copy__ = copy  # ensure compatibility with standard module copy
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class BitmapProcSet:
+    """
+    Set of non-negative integers stored as a dense bitmap.
+
+    A BitmapProcSet provides the same API as :class:`ProcSet`, but stores the
+    processors as the bits of a Python :class:`int` rather than as a list of
+    intervals.
+    Its memory footprint is proportional to the greatest processor rather than
+    to the number of intervals, which makes it suited to bounded processor
+    universes holding fragmented sets, where the set operations run as
+    word-level bitwise operations on the bitmaps.
+    """
+
+    __slots__ = ('_bits', )
+
+    def __init__(self, *intervals):
+        """
+        A BitmapProcSet is initialized with the same arguments as a
+        :class:`ProcSet`.
+        """
+        if len(intervals) == 1 and isinstance(intervals[0], BitmapProcSet):
+            self._bits = intervals[0]._bits
+        else:
+            # pylint: disable=protected-access
+            self._bits = _bits_from_bounds(ProcSet(*intervals)._bounds)
+
+    @classmethod
+    def _from_bits(cls, bits):
+        result = cls.__new__(cls)
+        result._bits = bits  # pylint: disable=protected-access
+        return result
+
+    @staticmethod
+    def _as_bits(other):
+        """Return other as a bitmap."""
+        # pylint: disable=protected-access
+        if isinstance(other, BitmapProcSet):
+            return other._bits
+        if isinstance(other, (RoaringProcSet, _ProcSetBase)):
+            return _bits_from_bounds(_ProcSetBase._as_bounds(other))
+        return _bits_from_bounds(ProcSet(other)._bounds)
+
+    def _to_bounds(self):
+        return _bounds_from_bits(self._bits)
+
+    @classmethod
+    def from_sorted(cls, iterable, validate=True):
+        """
+        Build a BitmapProcSet from a sorted iterable, as
+        :meth:`ProcSet.from_sorted` does.
+        """
+        return cls(ProcSet.from_sorted(iterable, validate))
+
+    @classmethod
+    def from_str(cls, string, insep="-", outsep=" "):
+        """
+        Build a BitmapProcSet from a string representation of an interval set,
+        as :meth:`ProcSet.from_str` does.
+        """
+        return cls(ProcSet.from_str(string, insep, outsep))
+
+    @classmethod
+    def from_bounds_array(cls, array):
+        """
+        Build a BitmapProcSet from a NumPy array of shape (N, 2), as
+        :meth:`ProcSet.from_bounds_array` does.
+        """
+        return cls(ProcSet.from_bounds_array(array))
+
+    def to_procset(self):
+        """Return the :class:`ProcSet` holding the processors of the bitmap."""
+        result = ProcSet()
+        # pylint: disable=protected-access
+        result._set_bounds(self._to_bounds())
+        return result
+
+    def __str__(self):
+        return format(self)
+
+    def __format__(self, format_spec):
+        return format(self.to_procset(), format_spec)
+
+    def __repr__(self):
+        args = (
+            str(inf) if inf == sup else str((inf, sup))
+            for inf, sup in _pairs(self._to_bounds())
+        )
+        return '{}({})'.format(type(self).__name__, ', '.join(args))
+
+    def __iter__(self):
+        """Iterate over the processors in the set by increasing order."""
+        for inf, sup in _pairs(self._to_bounds()):
+            yield from range(inf, sup + 1)
+
+    def __reversed__(self):
+        """Iterate over the processors in the set by decreasing order."""
+        return reversed(self.to_procset())
+
+    def iter_slice(self, start=None, stop=None, step=None):
+        """
+        Iterate over the processors in the set from *start* (included) to
+        *stop* (excluded) by steps of *step*.
+        """
+        return self.to_procset().iter_slice(start, stop, step)
+
+    def __contains__(self, item):
+        """Check if item is in the set."""
+        return item >= 0 and bool(self._bits >> item & 1)
+
+    def contains_many(self, items, subset=False):
+        """
+        Check which of the processors in *items* are in the set.
+
+        See :meth:`ProcSet.contains_many`.
+        """
+        return self.to_procset().contains_many(items, subset)
+
+    def __eq__(self, other):
+        if isinstance(other, BitmapProcSet):
+            return self._bits == other._bits
+        if not isinstance(other, (RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        # pylint: disable=protected-access
+        return self._to_bounds() == _ProcSetBase._as_bounds(other)
+
+    __hash__ = None  # mutable sets are not hashable
+
+    def __bool__(self):
+        return bool(self._bits)
+
+    def __len__(self):
+        return bin(self._bits).count('1')
+
+    def count(self):
+        """Return the number of disjoint intervals in the set."""
+        # the intervals start at the set bits whose lower neighbour is unset
+        return bin(self._bits & ~(self._bits << 1)).count('1')
+
+    def iscontiguous(self):
+        """Return ``True`` if the set is made of a unique interval."""
+        return self.count() <= 1
+
+    def isdisjoint(self, other):
+        """Return ``True`` if the set has no processor in common with *other*."""
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            other = ProcSet(*other)
+        return not self._bits & self._as_bits(other)
+
+    def issubset(self, other):
+        """Test whether every element in the set is in *other*."""
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            other = ProcSet(*other)
+        return self._bits & ~self._as_bits(other) == 0
+
+    def __le__(self, other):
+        """Test whether every element in the set is in *other*."""
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self.issubset(other)
+
+    def __lt__(self, other):
+        """
+        Test whether the set is a proper subset of *other*, that is
+        ``self <= other`` and ``self != other``.
+        """
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        other = self._as_bits(other)
+        return self._bits & ~other == 0 and self._bits != other
+
+    def issuperset(self, other):
+        """Test whether every element in *other* is in the set."""
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            other = ProcSet(*other)
+        return self._as_bits(other) & ~self._bits == 0
+
+    def __ge__(self, other):
+        """Test whether every element in *other* is in the set."""
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self.issuperset(other)
+
+    def __gt__(self, other):
+        """
+        Test whether the set is a proper superset of *other*, that is
+        ``self >= other`` and ``self != other``.
+        """
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        other = self._as_bits(other)
+        return other & ~self._bits == 0 and self._bits != other
+
+    def union(self, *others):
+        """Return a new set with elements from the set and all others."""
+        return self._from_bits(
+            _functools.reduce(_operator.or_, map(self._as_bits, others), self._bits)
+        )
+
+    def __or__(self, other):
+        """Return a new set with elements from the set and *other*."""
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self._from_bits(self._bits | self._as_bits(other))
+
+    def intersection(self, *others):
+        """Return a new set with elements common to the set and all others."""
+        return self._from_bits(
+            _functools.reduce(_operator.and_, map(self._as_bits, others), self._bits)
+        )
+
+    def __and__(self, other):
+        """Return a new set with elements common to the set and *other*."""
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self._from_bits(self._bits & self._as_bits(other))
+
+    def difference(self, *others):
+        """Return a new set with elements in the set that are not in the others."""
+        removed = _functools.reduce(_operator.or_, map(self._as_bits, others), 0)
+        return self._from_bits(self._bits & ~removed)
+
+    def __sub__(self, other):
+        """Return a new set with elements in the set that are not in *other*."""
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self._from_bits(self._bits & ~self._as_bits(other))
+
+    def symmetric_difference(self, other):
+        """
+        Return a new set with elements in either the set or *other*, but not in
+        both.
+        """
+        return self._from_bits(self._bits ^ self._as_bits(other))
+
+    def __xor__(self, other):
+        """
+        Return a new set with elements in either the set or *other*, but not in
+        both.
+        """
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self._from_bits(self._bits ^ self._as_bits(other))
+
+    def update(self, *others):
+        """Update the set, adding elements from all others."""
+        self._bits = _functools.reduce(_operator.or_, map(self._as_bits, others), self._bits)
+        return self
+
+    insert = update  # compatibility alias, as in ProcSet
+
+    def __ior__(self, other):
+        """Update the set, adding elements from *other*."""
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        self._bits |= self._as_bits(other)
+        return self
+
+    def intersection_update(self, *others):
+        """
+        Update the set, keeping only elements found in the set and all others.
+        """
+        self._bits = _functools.reduce(_operator.and_, map(self._as_bits, others), self._bits)
+        return self
+
+    def __iand__(self, other):
+        """Update the set, keeping only elements found in the set and *other*."""
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        self._bits &= self._as_bits(other)
+        return self
+
+    def difference_update(self, *others):
+        """Update the set, removing elements found in others."""
+        removed = _functools.reduce(_operator.or_, map(self._as_bits, others), 0)
+        self._bits &= ~removed
+        return self
+
+    discard = difference_update  # convenience alias, as in ProcSet
+
+    def __isub__(self, other):
+        """Update the set, removing elements found in *other*."""
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        self._bits &= ~self._as_bits(other)
+        return self
+
+    def symmetric_difference_update(self, other):
+        """
+        Update the set, keeping only elements found in either the set or
+        *other*, but not in both.
+        """
+        self._bits ^= self._as_bits(other)
+        return self
+
+    def __ixor__(self, other):
+        """
+        Update the set, keeping only elements found in either the set or
+        *other*, but not in both.
+        """
+        if not isinstance(other, (BitmapProcSet, RoaringProcSet, _ProcSetBase)):
+            return NotImplemented
+        self._bits ^= self._as_bits(other)
+        return self
+
+    def clear(self):
+        """Empty the set, removing all elements from it."""
+        self._bits = 0
+
+    def copy(self):
+        """Return a new set with the same elements."""
+        # the bitmap is an immutable int: it can be shared by the copies
+        return self._from_bits(self._bits)
+
+    __copy__ = copy  # ensure compatibility with standard module copy
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __getitem__(self, index):
+        return self.to_procset()[index]
+
+    __setitem__ = None  # it makes no sense to 'modify' a processor
+
+    def __delitem__(self, index):
+        raise NotImplementedError
+
+    def aggregate(self):
+        """
+        Return a new set that is the convex hull of the set.
+
+        See :meth:`ProcSet.aggregate`.
+        """
+        if not self._bits:
+            return self._from_bits(0)
+        return self._from_bits((1 << self.max + 1) - (1 << self.min))
+
+    def intervals(self):
+        """
+        Return an iterator over the intervals of the set in increasing order.
+        """
+        return map(_new_procint, _pairs(self._to_bounds()))
+
+    @property
+    def min(self):
+        """The first processor in the set (in increasing order)."""
+        if not self._bits:
+            raise ValueError('Empty ProcSet')
+        # isolate the lowest set bit
+        return (self._bits & -self._bits).bit_length() - 1
+
+    @property
+    def max(self):
+        """The last processor in the set (in increasing order)."""
+        if not self._bits:
+            raise ValueError('Empty ProcSet')
+        return self._bits.bit_length() - 1
+
+
+class RoaringProcSet:
+    """
+    Set of non-negative integers stored as a Roaring-style hybrid structure.
+
+    A RoaringProcSet provides the same API as :class:`ProcSet`.
+    The processors are split into chunks of 65536 consecutive processors, and
+    each chunk is stored in the cheapest of three containers: a list of
+    intervals, a sorted array of processors, or a bitmap.
+    The container of a chunk is picked again whenever the chunk changes, which
+    bounds the memory footprint and the cost of the set operations of every
+    chunk, whatever its fragmentation.
+    """
+
+    __slots__ = ('_chunks', )
+
+    def __init__(self, *intervals):
+        """
+        A RoaringProcSet is initialized with the same arguments as a
+        :class:`ProcSet`.
+        """
+        if len(intervals) == 1 and isinstance(intervals[0], RoaringProcSet):
+            # containers are never modified in place: they can be shared
+            self._chunks = dict(intervals[0]._chunks)
+        else:
+            # pylint: disable=protected-access
+            self._chunks = _chunks_from_bounds(ProcSet(*intervals)._bounds)
+
+    @classmethod
+    def _from_chunks(cls, chunks):
+        result = cls.__new__(cls)
+        result._chunks = chunks  # pylint: disable=protected-access
+        return result
+
+    @staticmethod
+    def _as_chunks(other):
+        """Return other as a dict of chunk containers."""
+        # pylint: disable=protected-access
+        if isinstance(other, RoaringProcSet):
+            return other._chunks
+        if isinstance(other, (BitmapProcSet, _ProcSetBase)):
+            return _chunks_from_bounds(_ProcSetBase._as_bounds(other))
+        return _chunks_from_bounds(ProcSet(other)._bounds)
+
+    def _to_bounds(self):
+        return _bounds_from_chunks(self._chunks)
+
+    @classmethod
+    def from_sorted(cls, iterable, validate=True):
+        """
+        Build a RoaringProcSet from a sorted iterable, as
+        :meth:`ProcSet.from_sorted` does.
+        """
+        return cls(ProcSet.from_sorted(iterable, validate))
+
+    @classmethod
+    def from_str(cls, string, insep="-", outsep=" "):
+        """
+        Build a RoaringProcSet from a string representation of an interval
+        set, as :meth:`ProcSet.from_str` does.
+        """
+        return cls(ProcSet.from_str(string, insep, outsep))
+
+    @classmethod
+    def from_bounds_array(cls, array):
+        """
+        Build a RoaringProcSet from a NumPy array of shape (N, 2), as
+        :meth:`ProcSet.from_bounds_array` does.
+        """
+        return cls(ProcSet.from_bounds_array(array))
+
+    def to_procset(self):
+        """Return the :class:`ProcSet` holding the processors of the set."""
+        result = ProcSet()
+        # pylint: disable=protected-access
+        result._set_bounds(self._to_bounds())
+        return result
+
+    def containers(self):
+        """
+        Return the list of (chunk index, container kind) pairs of the set, by
+        increasing chunk index, where the container kind is one of ``'run'``,
+        ``'array'`` and ``'bitmap'``.
+        """
+        return [(key, self._chunks[key][0]) for key in sorted(self._chunks)]
+
+    def __str__(self):
+        return format(self)
+
+    def __format__(self, format_spec):
+        return format(self.to_procset(), format_spec)
+
+    def __repr__(self):
+        args = (
+            str(inf) if inf == sup else str((inf, sup))
+            for inf, sup in _pairs(self._to_bounds())
+        )
+        return '{}({})'.format(type(self).__name__, ', '.join(args))
+
+    def __iter__(self):
+        """Iterate over the processors in the set by increasing order."""
+        for key in sorted(self._chunks):
+            base = key << _CHUNK_SHIFT
+            for inf, sup in _pairs(_chunk_bounds(self._chunks[key])):
+                yield from range(base + inf, base + sup + 1)
+
+    def __reversed__(self):
+        """Iterate over the processors in the set by decreasing order."""
+        return reversed(self.to_procset())
+
+    def iter_slice(self, start=None, stop=None, step=None):
+        """
+        Iterate over the processors in the set from *start* (included) to
+        *stop* (excluded) by steps of *step*.
+        """
+        return self.to_procset().iter_slice(start, stop, step)
+
+    def __contains__(self, item):
+        """Check if item is in the set."""
+        chunk = self._chunks.get(item >> _CHUNK_SHIFT) if item >= 0 else None
+        return chunk is not None and _chunk_contains(chunk, item & (_CHUNK_SIZE - 1))
+
+    def contains_many(self, items, subset=False):
+        """
+        Check which of the processors in *items* are in the set.
+
+        See :meth:`ProcSet.contains_many`.
+        """
+        return self.to_procset().contains_many(items, subset)
+
+    def __eq__(self, other):
+        if isinstance(other, RoaringProcSet):
+            # the container of a chunk only depends on its processors
+            return self._chunks == other._chunks
+        if not isinstance(other, (BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        # pylint: disable=protected-access
+        return self._to_bounds() == _ProcSetBase._as_bounds(other)
+
+    __hash__ = None  # mutable sets are not hashable
+
+    def __bool__(self):
+        return bool(self._chunks)
+
+    def __len__(self):
+        return sum(map(_chunk_len, self._chunks.values()))
+
+    def count(self):
+        """Return the number of disjoint intervals in the set."""
+        return len(self._to_bounds()) // 2
+
+    def iscontiguous(self):
+        """Return ``True`` if the set is made of a unique interval."""
+        return self.count() <= 1
+
+    def isdisjoint(self, other):
+        """Return ``True`` if the set has no processor in common with *other*."""
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            other = ProcSet(*other)
+        other = self._as_chunks(other)
+        return not any(
+            _chunk_op(chunk, other[key], _operator.and_, _intersection) is not None
+            for key, chunk in self._chunks.items()
+            if key in other
+        )
+
+    def _issubset(self, other):
+        return all(
+            key in other
+            and _chunk_op(chunk, other[key], _bits_difference, _difference) is None
+            for key, chunk in self._chunks.items()
+        )
+
+    def issubset(self, other):
+        """Test whether every element in the set is in *other*."""
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            other = ProcSet(*other)
+        return self._issubset(self._as_chunks(other))
+
+    def __le__(self, other):
+        """Test whether every element in the set is in *other*."""
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self.issubset(other)
+
+    def __lt__(self, other):
+        """
+        Test whether the set is a proper subset of *other*, that is
+        ``self <= other`` and ``self != other``.
+        """
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        other = self._as_chunks(other)
+        return self._issubset(other) and self._chunks != other
+
+    def issuperset(self, other):
+        """Test whether every element in *other* is in the set."""
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            other = ProcSet(*other)
+        return self._from_chunks(self._as_chunks(other))._issubset(self._chunks)
+
+    def __ge__(self, other):
+        """Test whether every element in *other* is in the set."""
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self.issuperset(other)
+
+    def __gt__(self, other):
+        """
+        Test whether the set is a proper superset of *other*, that is
+        ``self >= other`` and ``self != other``.
+        """
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        other = self._from_chunks(self._as_chunks(other))
+        # pylint: disable=protected-access
+        return other._issubset(self._chunks) and self._chunks != other._chunks
+
+    def _union_chunks(self, others):
+        chunks = self._chunks
+        for other in map(self._as_chunks, others):
+            chunks = _chunks_merge(chunks, other, _operator.or_, _union, True, True)
+        return chunks
+
+    def _intersection_chunks(self, others):
+        chunks = self._chunks
+        for other in map(self._as_chunks, others):
+            chunks = _chunks_merge(chunks, other, _operator.and_, _intersection, False, False)
+        return chunks
+
+    def _difference_chunks(self, others):
+        chunks = self._chunks
+        for other in map(self._as_chunks, others):
+            chunks = _chunks_merge(chunks, other, _bits_difference, _difference, True, False)
+        return chunks
+
+    def _symmetric_difference_chunks(self, other):
+        return _chunks_merge(
+            self._chunks, self._as_chunks(other),
+            _operator.xor, _symmetric_difference, True, True
+        )
+
+    def union(self, *others):
+        """Return a new set with elements from the set and all others."""
+        return self._from_chunks(dict(self._union_chunks(others)))
+
+    def __or__(self, other):
+        """Return a new set with elements from the set and *other*."""
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self._from_chunks(self._union_chunks((other, )))
+
+    def intersection(self, *others):
+        """Return a new set with elements common to the set and all others."""
+        return self._from_chunks(dict(self._intersection_chunks(others)))
+
+    def __and__(self, other):
+        """Return a new set with elements common to the set and *other*."""
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self._from_chunks(self._intersection_chunks((other, )))
+
+    def difference(self, *others):
+        """Return a new set with elements in the set that are not in the others."""
+        return self._from_chunks(dict(self._difference_chunks(others)))
+
+    def __sub__(self, other):
+        """Return a new set with elements in the set that are not in *other*."""
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self._from_chunks(self._difference_chunks((other, )))
+
+    def symmetric_difference(self, other):
+        """
+        Return a new set with elements in either the set or *other*, but not in
+        both.
+        """
+        return self._from_chunks(self._symmetric_difference_chunks(other))
+
+    def __xor__(self, other):
+        """
+        Return a new set with elements in either the set or *other*, but not in
+        both.
+        """
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self._from_chunks(self._symmetric_difference_chunks(other))
+
+    def update(self, *others):
+        """Update the set, adding elements from all others."""
+        self._chunks = self._union_chunks(others)
+        return self
+
+    insert = update  # compatibility alias, as in ProcSet
+
+    def __ior__(self, other):
+        """Update the set, adding elements from *other*."""
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self.update(other)
+
+    def intersection_update(self, *others):
+        """
+        Update the set, keeping only elements found in the set and all others.
+        """
+        self._chunks = self._intersection_chunks(others)
+        return self
+
+    def __iand__(self, other):
+        """Update the set, keeping only elements found in the set and *other*."""
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self.intersection_update(other)
+
+    def difference_update(self, *others):
+        """Update the set, removing elements found in others."""
+        self._chunks = self._difference_chunks(others)
+        return self
+
+    discard = difference_update  # convenience alias, as in ProcSet
+
+    def __isub__(self, other):
+        """Update the set, removing elements found in *other*."""
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self.difference_update(other)
+
+    def symmetric_difference_update(self, other):
+        """
+        Update the set, keeping only elements found in either the set or
+        *other*, but not in both.
+        """
+        self._chunks = self._symmetric_difference_chunks(other)
+        return self
+
+    def __ixor__(self, other):
+        """
+        Update the set, keeping only elements found in either the set or
+        *other*, but not in both.
+        """
+        if not isinstance(other, (RoaringProcSet, BitmapProcSet, _ProcSetBase)):
+            return NotImplemented
+        return self.symmetric_difference_update(other)
+
+    def clear(self):
+        """Empty the set, removing all elements from it."""
+        self._chunks = {}
+
+    def copy(self):
+        """Return a new set with the same elements."""
+        # containers are never modified in place: they can be shared
+        return self._from_chunks(dict(self._chunks))
+
+    __copy__ = copy  # ensure compatibility with standard module copy
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __getitem__(self, index):
+        return self.to_procset()[index]
+
+    __setitem__ = None  # it makes no sense to 'modify' a processor
+
+    def __delitem__(self, index):
+        raise NotImplementedError
+
+    def aggregate(self):
+        """
+        Return a new set that is the convex hull of the set.
+
+        See :meth:`ProcSet.aggregate`.
+        """
+        if not self._chunks:
+            return self._from_chunks({})
+        return type(self)(ProcInt(self.min, self.max))
+
+    def intervals(self):
+        """
+        Return an iterator over the intervals of the set in increasing order.
+        """
+        return map(_new_procint, _pairs(self._to_bounds()))
+
+    @property
+    def min(self):
+        """The first processor in the set (in increasing order)."""
+        if not self._chunks:
+            raise ValueError('Empty ProcSet')
+        key = min(self._chunks)
+        return (key << _CHUNK_SHIFT) + _chunk_bounds(self._chunks[key])[0]
+
+    @property
+    def max(self):
+        """The last processor in the set (in increasing order)."""
+        if not self._chunks:
+            raise ValueError('Empty ProcSet')
+        key = max(self._chunks)
+        return (key << _CHUNK_SHIFT) + _chunk_bounds(self._chunks[key])[-1]
+
+
+class ProcSetArchive:
+    """
+    Read-only collection of ProcSets stored in a memory-mapped file.
+
+    An archive file stores the bounds of all its ProcSets in a single flat
+    array, followed by the index of the offsets of each ProcSet in this array.
+    Opening an archive does not read the file: the ProcSets are read-only
+    :class:`FrozenProcSet` views of the memory-mapped file, built in constant
+    time when accessed by index, without any parsing nor copy.
+    Iterating over an archive reads the file sequentially.
+
+    Archive files are written by :meth:`write`, and use the native byte order
+    of the host that writes them.
+    """
+
+    def __init__(self, path):
+        """
+        Open the archive file at *path*.
+
+        :param path: \
+            path of the archive file, as written by :meth:`write`
+        """
+        with open(path, 'rb') as file:
+            size = _os.fstat(file.fileno()).st_size
+            if size < 8 * _ARCHIVE_HEADER_SIZE or size % 8:
+                raise ValueError('Invalid ProcSet archive: truncated file')
+            self._mmap = _mmap.mmap(file.fileno(), 0, access=_mmap.ACCESS_READ)
+
+        items = memoryview(self._mmap).cast('q')
+        try:
+            index_start = self._check_header(items)
+        except ValueError:
+            # do not leak the mapping of an invalid file
+            items.release()
+            self._mmap.close()
+            raise
+        self._items = items
+        self._bounds = items[_ARCHIVE_HEADER_SIZE:index_start]
+        self._index = items[index_start:]
+
+    @staticmethod
+    def _check_header(items):
+        """
+        Check the header and the bounds of the index of the archive in items,
+        and return the position of its index.
+        """
+        if items[:1].tobytes() != _ARCHIVE_MAGIC:
+            raise ValueError('Invalid ProcSet archive: bad magic number')
+        if items[1] != 1:
+            raise ValueError('Invalid ProcSet archive: mismatching byte order')
+        if items[2] != _ARCHIVE_VERSION:
+            raise ValueError('Unsupported ProcSet archive version: {}'.format(items[2]))
+        if items[3] < 0:
+            raise ValueError('Invalid ProcSet archive: negative number of ProcSets')
+        index_start = len(items) - items[3] - 1
+        if index_start < _ARCHIVE_HEADER_SIZE:
+            raise ValueError('Invalid ProcSet archive: truncated file')
+        # the offsets must span all the bounds, so that the number of ProcSets
+        # matches the index
+        if items[index_start] != 0 or items[-1] != index_start - _ARCHIVE_HEADER_SIZE:
+            raise ValueError('Invalid ProcSet archive: mismatching index')
+        return index_start
+
+    @staticmethod
+    def write(path, psets):
+        """
+        Write the ProcSets of the iterable *psets* to a new archive file at
+        *path*, and return the number of written ProcSets.
+
+        The ProcSets are written one at a time, so that *psets* may be a lazy
+        iterable.
+
+        :param path: \
+            path of the archive file (an existing file is overwritten)
+        :param psets: \
+            iterable of :class:`ProcSet` (or any single argument accepted by
+            the :class:`ProcSet` constructor)
+        """
+        index = _new_bounds((0, ))
+        with open(path, 'wb') as file:
+            file.write(_ARCHIVE_MAGIC)
+            file.write(_new_bounds((1, _ARCHIVE_VERSION, 0)))  # count set below
+            for pset in psets:
+                if not isinstance(pset, _ProcSetBase):
+                    pset = ProcSet(pset)
+                # pylint: disable=protected-access
+                file.write(pset._bounds)
+                index.append(index[-1] + len(pset._bounds))
+            file.write(index)
+            file.seek(len(_ARCHIVE_MAGIC))
+            file.write(_new_bounds((1, _ARCHIVE_VERSION, len(index) - 1)))
+        return len(index) - 1
+
+    def __len__(self):
+        return len(self._index) - 1
+
+    def __getitem__(self, index):
+        """Return the read-only view of the ProcSet at *index*."""
+        if isinstance(index, slice):
+            return [self[pos] for pos in range(*index.indices(len(self)))]
+        if not isinstance(index, int):
+            raise TypeError(
+                '{} indices must be integers or slices, not {}'.format(
+                    type(self).__name__,
+                    type(index).__name__
+                )
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('{} index out of range'.format(type(self).__name__))
+        return _restore_procset(
+            FrozenProcSet,
+            self._bounds[self._index[index]:self._index[index + 1]]
+        )
+
+    def __iter__(self):
+        """Iterate over the read-only views of the ProcSets of the archive."""
+        bounds, index = self._bounds, self._index
+        for pos in range(len(index) - 1):
+            yield _restore_procset(FrozenProcSet, bounds[index[pos]:index[pos + 1]])
+
+    def close(self):
+        """
+        Close the archive.
+
+        The memory mapping of the file is kept until all the views returned by
+        the archive are garbage collected.
+        """
+        for view in (self._index, self._bounds, self._items):
+            view.release()
+        try:
+            self._mmap.close()
+        except BufferError:  # views of the archive are still alive
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ProcMap:
+    """
+    Mapping of non-negative integers to values, stored as intervals.
+
+    A ProcMap maps the processors of disjoint intervals, called *runs*, to
+    values.
+    Adjacent runs mapped to equal values are merged, so that the memory
+    footprint of a ProcMap is proportional to its number of runs rather than
+    to its number of processors.
+    As in :class:`ProcSet`, the runs are stored as a flat array of bounds, and
+    looking up the value of a processor bisects this array.
+    """
+
+    __slots__ = ('_bounds', '_values')
+
+    def __init__(self, *items):
+        """
+        A ProcMap is initialized with *(key, value)* pairs, or with another
+        ProcMap.
+        A key is a processor, an interval, or a set of processors (i.e., any
+        argument accepted by :class:`ProcSet`).
+        When the keys of several pairs overlap, the later pairs override the
+        earlier ones.
+        """
+        if len(items) == 1 and isinstance(items[0], ProcMap):
+            # pylint: disable=protected-access
+            self._bounds = _new_bounds(items[0]._bounds)
+            self._values = list(items[0]._values)
+            return
+
+        self._bounds = _new_bounds()
+        self._values = []
+        for key, value in items:
+            self[key] = value
+
+    @staticmethod
+    def _key_itvs(key):
+        """Iterate over the (inf, sup) pairs of the processors of key."""
+        if not isinstance(key, slice):
+            return _ProcSetBase._as_itvs(key)  # pylint: disable=protected-access
+        if key.step is not None:
+            raise ValueError('ProcMap slices do not support steps')
+        start = 0 if key.start is None else key.start
+        stop = _MAX_BOUND + 1 if key.stop is None else key.stop
+        if not isinstance(start, int) or not isinstance(stop, int):
+            raise TypeError('ProcMap slice indices must be int')
+        if start < 0 or stop < 0:
+            raise ValueError('Invalid negative ProcMap slice indices')
+        return iter([(start, stop - 1)] if start < stop else [])
+
+    def _runs(self, inf, sup):
+        """Return the range of the indices of the runs overlapping [inf, sup]."""
+        bounds = self._bounds
+        return (
+            _bisect.bisect_left(bounds, inf) // 2,
+            (_bisect.bisect_right(bounds, sup) + 1) // 2,
+        )
+
+    def _assign(self, inf, sup, value, present):
+        """
+        Map the processors of [inf, sup] to value if present, or unmap them
+        otherwise.
+        """
+        bounds, values = self._bounds, self._values
+        if present and (not bounds or inf > bounds[-1]):
+            # fast path: the processors are mapped in increasing order
+            if bounds and bounds[-1] + 1 == inf and values[-1] == value:
+                bounds[-1] = sup
+            else:
+                bounds.append(inf)
+                bounds.append(sup)
+                values.append(value)
+            return
+
+        lo, hi = self._runs(inf, sup)
+        # the neighbouring runs are replaced as well, as they may be merged
+        # with the new run
+        lo, hi = max(lo - 1, 0), min(hi + 1, len(values))
+
+        # the runs lo..hi are clipped around [inf, sup], and spliced back
+        pieces = []
+        for run in range(lo, hi):
+            run_inf, run_sup = bounds[2 * run], bounds[2 * run + 1]
+            if run_inf < inf:
+                pieces.append((run_inf, min(run_sup, inf - 1), values[run]))
+        if present:
+            pieces.append((inf, sup, value))
+        for run in range(lo, hi):
+            run_inf, run_sup = bounds[2 * run], bounds[2 * run + 1]
+            if run_sup > sup:
+                pieces.append((max(run_inf, sup + 1), run_sup, values[run]))
+
+        new_bounds, new_values = _new_bounds(), []
+        for piece_inf, piece_sup, piece_value in pieces:
+            if (new_values and new_bounds[-1] + 1 == piece_inf
+                    and new_values[-1] == piece_value):
+                new_bounds[-1] = piece_sup
+            else:
+                new_bounds.append(piece_inf)
+                new_bounds.append(piece_sup)
+                new_values.append(piece_value)
+        bounds[2 * lo:2 * hi] = new_bounds
+        values[lo:hi] = new_values
+
+    def __getitem__(self, key):
+        """
+        Return the value of the processor *key*.
+
+        If *key* is a slice, return the ProcMap restricted to the processors
+        from *key.start* (included) to *key.stop* (excluded).
+        """
+        if isinstance(key, slice):
+            return self._restrict(self._key_itvs(key))
+        bounds = self._bounds
+        # same lookup as ProcSet.__contains__, the run of the processor is
+        # then given by the index of its bounds
+        index = _bisect.bisect_left(bounds, key)
+        if index & 1 or (index < len(bounds) and bounds[index] == key):
+            return self._values[index // 2]
+        raise KeyError(key)
+
+    def get(self, proc, default=None):
+        """Return the value of *proc* if it is mapped, else *default*."""
+        try:
+            return self[proc]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        """
+        Map all the processors of *key* to *value*.
+
+        *key* is a processor, an interval, a set of processors, or a slice.
+        """
+        for inf, sup in self._key_itvs(key):
+            self._assign(inf, sup, value, True)
+
+    def __delitem__(self, key):
+        """
+        Unmap all the processors of *key*.
+
+        Unlike :class:`dict`, no error is raised for unmapped processors.
+        """
+        for inf, sup in self._key_itvs(key):
+            self._assign(inf, sup, None, False)
+
+    def __contains__(self, proc):
+        """Check if the processor *proc* is mapped."""
+        bounds = self._bounds
+        index = _bisect.bisect_left(bounds, proc)
+        return bool(index & 1) or (index < len(bounds) and bounds[index] == proc)
+
+    def _restrict(self, itvs):
+        """Return the ProcMap restricted to the disjoint intervals of itvs."""
+        bounds, values = self._bounds, self._values
+        result = ProcMap()
+        # pylint: disable=protected-access
+        for inf, sup in itvs:
+            lo, hi = self._runs(inf, sup)
+            for run in range(lo, hi):
+                result._bounds.append(max(bounds[2 * run], inf))
+                result._bounds.append(min(bounds[2 * run + 1], sup))
+                result._values.append(values[run])
+        return result
+
+    def restrict(self, other):
+        """
+        Return a new ProcMap restricted to the processors of *other*.
+
+        *other* is a processor, an interval, or a set of processors.
+        """
+        # pylint: disable=protected-access
+        return self._restrict(_pairs(ProcSet(other)._bounds))
+
+    def select(self, predicate):
+        """
+        Return the :class:`ProcSet` of the processors whose value satisfies
+        *predicate*.
+
+        *predicate* is called once per run, and not once per processor.
+        """
+        bounds = _new_bounds()
+        for (inf, sup), value in zip(_pairs(self._bounds), self._values):
+            if predicate(value):
+                if bounds and bounds[-1] + 1 == inf:  # adjacent runs
+                    bounds[-1] = sup
+                else:
+                    bounds.append(inf)
+                    bounds.append(sup)
+        return _restore_procset(ProcSet, bounds)
+
+    def keys(self):
+        """Return the :class:`ProcSet` of the mapped processors."""
+        return self.select(lambda value: True)
+
+    def values(self):
+        """Iterate over the values of the runs of the ProcMap."""
+        return iter(self._values)
+
+    def items(self):
+        """
+        Iterate over the runs of the ProcMap, as *(interval, value)* pairs of
+        :class:`ProcInt` and value.
+        """
+        return zip(map(_new_procint, _pairs(self._bounds)), self._values)
+
+    def count(self):
+        """Return the number of runs of the ProcMap."""
+        return len(self._values)
+
+    def __len__(self):
+        """Return the number of processors mapped by the ProcMap."""
+        bounds = self._bounds
+        return sum(bounds[1::2]) - sum(bounds[::2]) + len(bounds) // 2
+
+    def __bool__(self):
+        return bool(self._values)
+
+    def __iter__(self):
+        """Iterate over the mapped processors by increasing order."""
+        for inf, sup in _pairs(self._bounds):
+            yield from range(inf, sup + 1)
+
+    def __eq__(self, other):
+        if not isinstance(other, ProcMap):
+            return NotImplemented
+        # pylint: disable=protected-access
+        return self._bounds == other._bounds and self._values == other._values
+
+    def __repr__(self):
+        args = (
+            '({}, {!r})'.format(inf if inf == sup else (inf, sup), value)
+            for (inf, sup), value in zip(_pairs(self._bounds), self._values)
+        )
+        return '{}({})'.format(type(self).__name__, ', '.join(args))
+
+    def copy(self):
+        """Return a shallow copy of the ProcMap."""
+        return ProcMap(self)
+
+    __copy__ = copy  # ensure compatibility with standard module copy
+
+
+class ProcSetTimeline:
+    """
+    Availability profile of processors over time.
+
+    A ProcSetTimeline stores the set of free processors as a step function of
+    time: each step holds the :class:`FrozenProcSet` of the processors that are
+    free from its start time until the start of the next step, and the last
+    step lasts forever.
+    Consecutive steps holding the same processors are merged.
+
+    Reserving and releasing processors only split and update the steps
+    overlapping the reservation, and the queries for the earliest
+    availability of processors walk the steps forward from the requested time,
+    until the first fit.
+    """
+
+    __slots__ = ('_times', '_free')
+
+    def __init__(self, procs, start=0):
+        """
+        Create the profile of the processors *procs*, all free from *start*
+        onwards.
+
+        :param procs: \
+            processors of the platform, as any argument accepted by
+            :class:`ProcSet`
+        :param start: \
+            start time of the profile (defaults to ``0``)
+        """
+        self._times = [start]
+        self._free = [FrozenProcSet(procs)]
+
+    def _step(self, time):
+        """Return the index of the step holding time."""
+        if time < self._times[0]:
+            raise ValueError('Time {!r} precedes the start of the timeline'.format(time))
+        return _bisect.bisect_right(self._times, time) - 1
+
+    def _split(self, time):
+        """Return the index of the step starting at time, splitting a step if needed."""
+        index = self._step(time)
+        if self._times[index] != time:
+            index += 1
+            self._times.insert(index, time)
+            self._free.insert(index, self._free[index - 1])
+        return index
+
+    def _update(self, procs, start, end, operation, check):
+        """Apply operation to the steps of [start, end) once check holds."""
+        if not start < end:
+            raise ValueError('Invalid reservation bounds: {!r} >= {!r}'.format(start, end))
+        # all the steps are checked before any of them is modified
+        lo, hi = self._step(start), _bisect.bisect_left(self._times, end)
+        for free in self._free[lo:hi]:
+            if not check(procs, free):
+                return False
+
+        lo, hi = self._split(start), self._split(end)
+        free = self._free
+        for index in range(lo, hi):
+            free[index] = operation(free[index], procs)
+        # merge the steps that hold the same processors, including the steps
+        # around the reservation
+        for index in range(min(hi, len(free) - 1), max(lo, 1) - 1, -1):
+            if free[index] == free[index - 1]:
+                del self._times[index]
+                del free[index]
+        return True
+
+    def reserve(self, procs, start, end):
+        """
+        Reserve the processors *procs* from *start* (included) to *end*
+        (excluded).
+
+        Raise :exc:`ValueError` if some of *procs* are not free during the
+        whole reservation.
+        """
+        procs = FrozenProcSet(procs)
+        if not self._update(procs, start, end, _operator.sub, FrozenProcSet.issubset):
+            raise ValueError(
+                'Processors {} are not free from {!r} to {!r}'.format(procs, start, end)
+            )
+
+    def release(self, procs, start, end):
+        """
+        Release the processors *procs* from *start* (included) to *end*
+        (excluded), e.g., to cancel a reservation.
+
+        Raise :exc:`ValueError` if some of *procs* are free during the
+        release.
+        """
+        procs = FrozenProcSet(procs)
+        if not self._update(procs, start, end, _operator.or_, FrozenProcSet.isdisjoint):
+            raise ValueError(
+                'Processors {} are not reserved from {!r} to {!r}'.format(procs, start, end)
+            )
+
+    def free_at(self, time):
+        """Return the :class:`FrozenProcSet` of the processors free at *time*."""
+        return self._free[self._step(time)]
+
+    def steps(self):
+        """
+        Iterate over the steps of the profile, as *(time, procs)* pairs of the
+        start time of the step and of the :class:`FrozenProcSet` of the
+        processors free during the step.
+        """
+        return zip(self._times, self._free)
+
+    def earliest(self, duration, count=None, procs=None, after=None):
+        """
+        Return the earliest time at which *count* processors, or the
+        processors *procs*, stay free for *duration*.
+
+        Return a *(time, procs)* pair of the earliest start time, not before
+        *after*, and of the :class:`FrozenProcSet` of the processors free
+        during the whole window, or ``None`` if no such time exists.
+        Exactly one of *count* and *procs* must be given.
+
+        :param duration: \
+            duration of the window (positive)
+        :param int count: \
+            number of processors, that must be the same during the whole window
+        :param procs: \
+            processors that must be free, as any argument accepted by
+            :class:`ProcSet`
+        :param after: \
+            earliest start time (defaults to the start of the profile)
+        """
+        if (count is None) == (procs is None):
+            raise TypeError('earliest() expects exactly one of count and procs')
+        if not duration > 0:
+            raise ValueError('Invalid non-positive duration: {!r}'.format(duration))
+        if procs is None:
+            def fits(free):
+                return len(free) >= count
+        else:
+            fits = FrozenProcSet(procs).issubset
+
+        times, free = self._times, self._free
+        if after is None:
+            after = times[0]
+        index = self._step(after)
+        while index < len(times):
+            if not fits(free[index]):
+                index += 1
+                continue
+            start = max(after, times[index])
+            window = free[index]
+            last = index
+            # extend the window over the next steps, until it lasts duration
+            while last + 1 < len(times) and times[last + 1] - start < duration:
+                last += 1
+                window &= free[last]
+                if not fits(window):
+                    break
+            else:
+                return start, window
+            # a step where the request does not fit on its own rules out all
+            # the windows holding it
+            index = last + 1 if not fits(free[last]) else index + 1
+        return None
+
+    def __len__(self):
+        """Return the number of steps of the profile."""
+        return len(self._times)
+
+    def __repr__(self):
+        return '<{} {}>'.format(
+            type(self).__name__,
+            ', '.join('{!r}: {}'.format(time, free) for time, free in self.steps())
+        )
+
+
+def format_many(psets, format_spec=''):
+    """
+    Return the list of the string representations of each set of *psets*, as
+    ``format(pset, format_spec)`` would.
+
+    The format specifier is parsed once for the whole batch, and the string
+    representation of each distinct interval bound is rendered only once.
+    Strings already cached by a :class:`ProcSet` are reused.
+
+    :param psets: \
+        iterable of :class:`ProcSet` (or of any object accepted by the
+        :class:`ProcSet` set operations)
+    :param str format_spec: \
+        format specifier, as for :meth:`ProcSet.__format__`
+    """
+    if format_spec:
+        try:
+            insep, outsep = format_spec
+        except ValueError:
+            raise ValueError('Invalid format specifier') from None
+    else:
+        insep, outsep = '- '
+
+    # pylint: disable=protected-access
+    batch = []
+    append = batch.append
+    for pset in psets:
+        formats = pset._formats if isinstance(pset, _ProcSetBase) else None
+        if formats and format_spec in formats:
+            append((formats[format_spec], ()))
+        else:
+            append((None, _ProcSetBase._as_bounds(pset)))
+
+    # When the bounds repeat across the batch (i.e., they span a range smaller
+    # than their count), all the values of the range are rendered once in a
+    # shared table, instead of once per occurrence.
+    count = sum(len(bounds) for _, bounds in batch)
+    highest = max((bounds[-1] for _, bounds in batch if bounds), default=-1)
+    if 2 * (highest + 1) <= count:
+        render = list(map(str, range(highest + 1))).__getitem__
+    else:
+        render = str
+    return [
+        outsep.join([
+            render(inf) if inf == sup else render(inf) + insep + render(sup)
+            for inf, sup in _pairs(bounds)
+        ]) if string is None else string
+        for string, bounds in batch
+    ]
+
+
+def parse_many(strings, insep="-", outsep=" "):
+    """
+    Return the list of the :class:`ProcSet` built from each string
+    representation of an interval set in *strings*, as :meth:`ProcSet.from_str`
+    would.
+
+    :param strings: \
+        iterable of :class:`str` to parse
+    :param str insep: \
+        delimiter character between the boundaries of a single interval
+        (defaults to ``-``, ascii dash symbol ``0x2d``)
+    :param str outsep: \
+        delimiter character between two intervals
+        (defaults to ``␣``, ascii space symbol ``0x20``)
+    """
+    result = []
+    append = result.append
+    for string in strings:
+        if not isinstance(string, str):
+            raise TypeError('strings must hold str, not {}'.format(type(string).__name__))
+        append(_restore_procset(ProcSet, _parse_bounds(string, insep, outsep)))
+    return result
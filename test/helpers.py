@@ -21,9 +21,25 @@
 
 
 import pytest
+from procset import ProcSet
 
 
 def dict_parametrize(argnames, paramsdict, indirect=False, scope=None):
     """Decorator to parametrize test functions from a (id, argvalue) dict."""
     ids, argvalues = zip(*paramsdict.items())  # ensure id matches its argvalue
     return pytest.mark.parametrize(argnames, argvalues, indirect, ids, scope)
+
+
+def random_procset(rng):
+    """Random ProcSet mixing long runs, dense and sparse pockets."""
+    intervals = []
+    for _ in range(rng.randint(0, 6)):
+        base = rng.randrange(1 << 18)
+        kind = rng.randrange(3)
+        if kind == 0:  # long run, possibly spanning several 65536-wide chunks
+            intervals.append((base, base + rng.randrange(3 << 16)))
+        elif kind == 1:  # heavily fragmented pocket
+            intervals.extend(rng.sample(range(base, base + 16384), 4096))
+        else:  # sparse pocket
+            intervals.extend(rng.sample(range(base, base + 65536), rng.randint(1, 64)))
+    return ProcSet(*intervals)
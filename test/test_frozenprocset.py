@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © 2017—2019
+# Contributed by Raphaël Bleuse <cs@research.bleuse.net>
+#
+# This file is part of procset.py, a pure python module to manage sets of
+# closed intervals.
+#
+#   procset.py is free software: you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License version 3 only
+#   as published by the Free Software Foundation.
+#
+#   procset.py is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License version 3 for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License version 3 along with this program.  If not, see
+#   <https://www.gnu.org/licenses/>.
+
+import array
+import copy
+import pickle
+import pytest
+from procset import FrozenProcSet, ProcInt, ProcSet
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestNew:
+    def test_empty(self):
+        fpset = FrozenProcSet()
+        assert list(fpset) == []
+        assert len(fpset) == 0
+
+    def test_mixed_int_procint_procset(self):
+        fpset = FrozenProcSet(0, (2, 6), ProcSet(3, (5, 7)), FrozenProcSet(9))
+        assert list(fpset) == [0, 2, 3, 4, 5, 6, 7, 9]
+        assert fpset.count() == 3
+
+    def test_from_str(self):
+        fpset = FrozenProcSet.from_str('0-3 5')
+        assert isinstance(fpset, FrozenProcSet)
+        assert fpset == FrozenProcSet((0, 3), 5)
+
+    def test_from_sorted(self):
+        fpset = FrozenProcSet.from_sorted([0, 1, 2, 5])
+        assert isinstance(fpset, FrozenProcSet)
+        assert fpset == FrozenProcSet((0, 2), 5)
+
+    def test_repr(self):
+        fpset = FrozenProcSet((0, 3), 5)
+        assert repr(fpset) == 'FrozenProcSet((0, 3), 5)'
+        assert fpset == eval(repr(fpset))
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestHash:
+    def test_equal_sets(self):
+        left, right = FrozenProcSet((0, 3), 5), FrozenProcSet(0, (1, 3), 5)
+        assert left is not right
+        assert hash(left) == hash(right)
+        assert left == right
+
+    def test_dict_key(self):
+        cache = {FrozenProcSet((0, 3)): 'a', FrozenProcSet(): 'b'}
+        assert cache[FrozenProcSet(0, 1, 2, 3)] == 'a'
+        assert cache[FrozenProcSet()] == 'b'
+        assert FrozenProcSet(4) not in cache
+
+    def test_equal_lazy_hash(self):
+        # pylint: disable=protected-access
+        left, right = FrozenProcSet((0, 3), 5), FrozenProcSet((0, 3), 5)
+        assert left == right
+        assert left != FrozenProcSet((0, 3), 6)
+        assert left != FrozenProcSet((0, 3))
+        # comparing sets does not hash them
+        assert left._hash is None
+        assert right._hash is None
+
+    def test_equal_cached_hash(self):
+        left, right = FrozenProcSet((0, 3), 5), FrozenProcSet((0, 3), 6)
+        hash(left), hash(right)
+        assert left != right
+        assert left == FrozenProcSet((0, 3), 5)
+
+    def test_unhashable_procset(self):
+        with pytest.raises(TypeError):
+            hash(ProcSet())
+
+    def test_different_sets(self):
+        assert FrozenProcSet((0, 3)) != FrozenProcSet((0, 4))
+        assert FrozenProcSet((0, 3)) != FrozenProcSet((0, 1), 3)
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestImmutability:
+    @pytest.mark.parametrize(
+        'method',
+        (
+            'update', 'insert', 'intersection_update', 'difference_update',
+            'discard', 'symmetric_difference_update', 'clear',
+        )
+    )
+    def test_no_mutation_method(self, method):
+        assert not hasattr(FrozenProcSet(), method)
+
+    def test_augmented_assignment(self):
+        fpset = FrozenProcSet((0, 3))
+        orig = fpset
+        fpset |= ProcSet(7)
+        fpset -= ProcSet(0)
+        assert isinstance(fpset, FrozenProcSet)
+        assert fpset == ProcSet((1, 3), 7)
+        assert fpset is not orig
+        assert orig == ProcSet((0, 3))
+
+    def test_copy(self):
+        fpset = FrozenProcSet((0, 3))
+        assert fpset.copy() is fpset
+        assert copy.copy(fpset) is fpset
+        assert copy.deepcopy(fpset) is fpset
+
+    def test_pickle(self):
+        fpset = FrozenProcSet((0, 3), 7)
+        unpickled = pickle.loads(pickle.dumps(fpset))
+        assert isinstance(unpickled, FrozenProcSet)
+        assert unpickled == fpset
+        assert hash(unpickled) == hash(fpset)
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestInteroperability:
+    @pytest.mark.parametrize('operator', ('__or__', '__and__', '__sub__', '__xor__'))
+    def test_operators(self, operator):
+        pset, fpset = ProcSet((0, 3), 8), FrozenProcSet((2, 9))
+        # the result has the type of the left operand, as for set and frozenset
+        left_result = getattr(pset, operator)(fpset)
+        right_result = getattr(fpset, operator)(pset)
+        assert type(left_result) is ProcSet
+        assert type(right_result) is FrozenProcSet
+        assert left_result == getattr(pset, operator)(ProcSet(fpset))
+        assert right_result == getattr(ProcSet(fpset), operator)(pset)
+
+    def test_inplace_operators(self):
+        pset = orig = ProcSet((0, 3))
+        pset |= FrozenProcSet((4, 5))
+        pset -= FrozenProcSet(0)
+        pset &= FrozenProcSet((1, 9))
+        pset ^= FrozenProcSet((5, 6))
+        # the ProcSet is updated in place, as set is with frozenset operands
+        assert pset is orig
+        assert type(pset) is ProcSet
+        assert pset == ProcSet((1, 4), 6)
+
+    def test_inplace_operators_view(self):
+        pset = orig = ProcSet((0, 3))
+        pset |= FrozenProcSet.from_buffer(array.array('q', [5, 6]))
+        assert pset is orig
+        assert pset == ProcSet((0, 3), (5, 6))
+
+    def test_methods(self):
+        fpset = FrozenProcSet((0, 3))
+        assert fpset.union(5, ProcSet(7)) == ProcSet((0, 3), 5, 7)
+        assert fpset.intersection((2, 9)) == ProcSet((2, 3))
+        assert fpset.difference(FrozenProcSet(1)) == ProcSet(0, (2, 3))
+        assert isinstance(fpset.union(5), FrozenProcSet)
+
+    def test_comparisons(self):
+        pset, fpset = ProcSet((0, 3)), FrozenProcSet((0, 3))
+        assert pset == fpset
+        assert fpset == pset
+        assert pset <= fpset
+        assert fpset >= pset
+        assert not fpset < pset
+        assert FrozenProcSet(1) < pset
+        assert fpset.issuperset(ProcInt(1, 2))
+        assert fpset.isdisjoint(ProcSet(5))
+
+    def test_not_equal_other_types(self):
+        assert FrozenProcSet() != set()
+        assert ProcSet((0, 1)) != (0, 1)
@@ -20,6 +20,7 @@
 #   <https://www.gnu.org/licenses/>.
 
 import copy
+import pickle
 import pytest
 from procset import ProcInt
 
@@ -124,3 +125,14 @@ class TestCopy:
         copy_itv = copy.deepcopy(itv)
         assert copy_itv == itv
         assert copy_itv is not itv
+
+
+# pylint: disable=no-self-use
+class TestPickle:
+    @pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+    def test_pickle(self, protocol):
+        itv = ProcInt(0, 3)
+        unpickled = pickle.loads(pickle.dumps(itv, protocol))
+        assert type(unpickled) is ProcInt
+        assert unpickled == itv
+        assert (unpickled.inf, unpickled.sup) == (0, 3)
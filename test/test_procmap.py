@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © 2017—2019
+# Contributed by Raphaël Bleuse <cs@research.bleuse.net>
+#
+# This file is part of procset.py, a pure python module to manage sets of
+# closed intervals.
+#
+#   procset.py is free software: you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License version 3 only
+#   as published by the Free Software Foundation.
+#
+#   procset.py is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License version 3 for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License version 3 along with this program.  If not, see
+#   <https://www.gnu.org/licenses/>.
+
+import copy
+import pickle
+import random
+import pytest
+from procset import ProcInt, ProcMap, ProcSet
+
+
+def _assert_normalized(pmap):
+    """Check that adjacent runs of pmap are mapped to different values."""
+    runs = list(pmap.items())
+    for (itv, value), (next_itv, next_value) in zip(runs, runs[1:]):
+        assert itv.sup < next_itv.inf
+        assert itv.sup + 1 < next_itv.inf or value != next_value
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestNew:
+    def test_empty(self):
+        pmap = ProcMap()
+        assert list(pmap) == []
+        assert len(pmap) == 0
+        assert pmap.count() == 0
+        assert not pmap
+
+    def test_items(self):
+        pmap = ProcMap(((0, 3), 'a'), (ProcSet(5, (7, 8)), 'b'))
+        assert list(pmap) == [0, 1, 2, 3, 5, 7, 8]
+        assert list(pmap.items()) == [
+            (ProcInt(0, 3), 'a'), (ProcInt(5, 5), 'b'), (ProcInt(7, 8), 'b')
+        ]
+        assert list(pmap.values()) == ['a', 'b', 'b']
+        assert len(pmap) == 7
+
+    def test_merge_adjacent(self):
+        pmap = ProcMap(*((proc, 'node{}'.format(proc // 4)) for proc in range(16)))
+        assert pmap.count() == 4
+        assert list(pmap.items())[1] == (ProcInt(4, 7), 'node1')
+
+    def test_override(self):
+        pmap = ProcMap(((0, 9), 'a'), ((3, 4), 'b'), (4, 'a'))
+        assert pmap == ProcMap(((0, 2), 'a'), (3, 'b'), ((4, 9), 'a'))
+
+    def test_copy(self):
+        pmap = ProcMap(((0, 3), 'a'))
+        for other in (ProcMap(pmap), pmap.copy(), copy.copy(pmap)):
+            assert other == pmap
+            other[0] = 'b'
+            assert pmap[0] == 'a'
+
+    def test_pickle(self):
+        pmap = ProcMap(((0, 3), 'a'), (5, 'b'))
+        assert pickle.loads(pickle.dumps(pmap)) == pmap
+
+    def test_repr(self):
+        pmap = ProcMap(((0, 3), 'a'), (5, 1.5))
+        assert repr(pmap) == "ProcMap(((0, 3), 'a'), (5, 1.5))"
+        assert pmap == eval(repr(pmap))
+
+    def test_invalid_key(self):
+        with pytest.raises(ValueError, match=r'^Invalid negative bound\(s\)$'):
+            ProcMap((-1, 'a'))
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestLookup:
+    PMAP = ProcMap(((0, 3), 'a'), (5, 'b'), ((8, 9), 'a'))
+
+    def test_getitem(self):
+        assert [self.PMAP[proc] for proc in (0, 3, 5, 8, 9)] == ['a', 'a', 'b', 'a', 'a']
+
+    @pytest.mark.parametrize('proc', [4, 6, 10, 100])
+    def test_getitem_unmapped(self, proc):
+        with pytest.raises(KeyError):
+            self.PMAP[proc]  # pylint: disable=pointless-statement
+        assert self.PMAP.get(proc) is None
+        assert self.PMAP.get(proc, 'z') == 'z'
+        assert proc not in self.PMAP
+
+    def test_contains(self):
+        assert all(proc in self.PMAP for proc in (0, 3, 5, 8, 9))
+
+    def test_slice(self):
+        assert self.PMAP[2:9] == ProcMap(((2, 3), 'a'), (5, 'b'), (8, 'a'))
+        assert self.PMAP[:1] == ProcMap((0, 'a'))
+        assert self.PMAP[5:] == ProcMap((5, 'b'), ((8, 9), 'a'))
+        assert self.PMAP[6:8] == ProcMap()
+        assert self.PMAP[4:2] == ProcMap()
+
+    @pytest.mark.parametrize('key, error', [
+        (slice(0, 4, 2), ValueError),
+        (slice(-1, 4), ValueError),
+        (slice('a', 4), TypeError),
+    ])
+    def test_slice_invalid(self, key, error):
+        with pytest.raises(error):
+            self.PMAP[key]  # pylint: disable=pointless-statement
+
+    def test_restrict(self):
+        pset = ProcSet((1, 2), (4, 5), 9)
+        assert self.PMAP.restrict(pset) == ProcMap(((1, 2), 'a'), (5, 'b'), (9, 'a'))
+        assert self.PMAP.restrict(ProcInt(3, 5)) == ProcMap((3, 'a'), (5, 'b'))
+
+    def test_select(self):
+        assert self.PMAP.select(lambda value: value == 'a') == ProcSet((0, 3), (8, 9))
+        assert self.PMAP.select(lambda value: False) == ProcSet()
+        assert type(self.PMAP.select(bool)) is ProcSet  # pylint: disable=unidiomatic-typecheck
+
+    def test_select_adjacent_runs(self):
+        pmap = ProcMap(((0, 3), 1), ((4, 5), 2), (6, 0))
+        assert pmap.select(bool) == ProcSet((0, 5))
+        assert pmap.select(bool).count() == 1
+
+    def test_select_once_per_run(self):
+        values = []
+        self.PMAP.select(values.append)
+        assert values == ['a', 'b', 'a']
+
+    def test_keys(self):
+        assert self.PMAP.keys() == ProcSet((0, 3), 5, (8, 9))
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestUpdate:
+    def test_setitem_slice(self):
+        pmap = ProcMap(((0, 9), 'a'))
+        pmap[2:4] = 'b'
+        assert pmap == ProcMap(((0, 1), 'a'), ((2, 3), 'b'), ((4, 9), 'a'))
+
+    def test_setitem_merge(self):
+        pmap = ProcMap(((0, 1), 'a'), (3, 'b'), ((4, 5), 'a'))
+        pmap[2:4] = 'a'
+        assert pmap == ProcMap(((0, 5), 'a'))
+        assert pmap.count() == 1
+
+    def test_setitem_procset(self):
+        pmap = ProcMap(((0, 9), 'a'))
+        pmap[ProcSet(1, (5, 6))] = 'b'
+        assert pmap == ProcMap((0, 'a'), (1, 'b'), ((2, 4), 'a'), ((5, 6), 'b'), ((7, 9), 'a'))
+
+    def test_delitem(self):
+        pmap = ProcMap(((0, 9), 'a'))
+        del pmap[ProcInt(3, 4)]
+        del pmap[20]  # unmapped processors are ignored
+        assert pmap == ProcMap(((0, 2), 'a'), ((5, 9), 'a'))
+        del pmap[:]
+        assert not pmap
+
+    @pytest.mark.parametrize('seed', range(8))
+    def test_random(self, seed):
+        rng = random.Random(seed)
+        pmap, expected = ProcMap(), {}
+        for _ in range(50):
+            inf = rng.randrange(60)
+            sup = inf + rng.randrange(8)
+            if rng.random() < 0.7:
+                value = rng.randrange(3)
+                pmap[ProcInt(inf, sup)] = value
+                expected.update(dict.fromkeys(range(inf, sup + 1), value))
+            else:
+                del pmap[inf:sup + 1]
+                for proc in range(inf, sup + 1):
+                    expected.pop(proc, None)
+            _assert_normalized(pmap)
+            assert len(pmap) == len(expected)
+            assert {proc: pmap.get(proc) for proc in range(70)} == \
+                {proc: expected.get(proc) for proc in range(70)}
@@ -19,10 +19,13 @@
 #   License version 3 along with this program.  If not, see
 #   <https://www.gnu.org/licenses/>.
 
+import array
 import copy
+import io
 import itertools
+import pickle
 import pytest
-from procset import ProcInt, ProcSet
+from procset import FrozenProcSet, ProcInt, ProcSet, format_many, parse_many
 
 
 # used by {TestNew,TestInsert}::test_incompatible_iter_length
@@ -123,6 +126,18 @@ class TestNew:
         assert len(pset) == 7
         assert pset.count() == 2
 
+    def test_unsorted_overlapping(self):
+        pset = ProcSet((8, 9), 3, (0, 2), (5, 8), 4, (12, 14), (6, 7), 11)
+        assert list(pset) == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 13, 14]
+        assert len(pset) == 14
+        assert pset.count() == 2
+
+    def test_many_shuffled_ints(self):
+        ids = list(range(0, 2000, 2)) + list(range(1, 1000, 2))
+        pset = ProcSet(*reversed(ids))
+        assert list(pset) == list(range(1000)) + list(range(1000, 2000, 2))
+        assert pset.count() == 500
+
     @pytest.mark.parametrize('iterable', INCOMPATIBLE_ITER_LENGTH_TESTCASES, ids=repr)
     def test_incompatible_iter_length(self, iterable):
         pattern = '^Incompatible iterable, expected an iterable of exactly 2 int$'
@@ -139,6 +154,75 @@ class TestNew:
         with pytest.raises(TypeError):
             ProcSet(None)
 
+    @pytest.mark.parametrize('args', [(2**63, ), ((0, 2**63), ), (2**64, 0)], ids=repr)
+    def test_overflow(self, args):
+        with pytest.raises(ValueError, match=r'^Invalid bound\(s\) greater than 9223372036854775807$'):
+            ProcSet(*args)
+        with pytest.raises(ValueError, match=r'^Invalid bound\(s\) greater than'):
+            ProcSet().update(*args)
+
+    def test_max_bound(self):
+        assert list(ProcSet(2**63 - 1)) == [2**63 - 1]
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestFromSorted:
+    def test_empty(self):
+        pset = ProcSet.from_sorted([])
+        assert pset == ProcSet()
+        assert pset.count() == 0
+
+    def test_ints(self):
+        pset = ProcSet.from_sorted(iter([0, 1, 2, 4, 6, 7]))
+        assert pset == ProcSet((0, 2), 4, (6, 7))
+        assert pset.count() == 3
+
+    def test_duplicate_ints(self):
+        pset = ProcSet.from_sorted([0, 0, 1, 3, 3])
+        assert pset == ProcSet((0, 1), 3)
+
+    def test_mixed_int_procint(self):
+        pset = ProcSet.from_sorted([0, ProcInt(1, 3), ProcInt(2, 5), 6, ProcInt(9, 10), 12])
+        assert pset == ProcSet((0, 6), (9, 10), 12)
+        assert pset.count() == 3
+
+    def test_nested_procint(self):
+        pset = ProcSet.from_sorted([ProcInt(0, 10), ProcInt(2, 3), 7])
+        assert pset == ProcSet((0, 10))
+
+    def test_tuples(self):
+        pset = ProcSet.from_sorted([(0, 1), [3, 4]])
+        assert pset == ProcSet((0, 1), (3, 4))
+
+    def test_procset_intervals(self):
+        orig = ProcSet((0, 3), (5, 8), 13)
+        assert ProcSet.from_sorted(orig.intervals()) == orig
+        assert ProcSet.from_sorted(orig) == orig
+
+    def test_large(self):
+        ids = [i for i in range(100000) if i % 3]
+        pset = ProcSet.from_sorted(ids, validate=False)
+        assert pset == ProcSet(*ids)
+        assert len(pset) == len(ids)
+
+    def test_unsorted(self):
+        with pytest.raises(ValueError, match='^Unsorted iterable'):
+            ProcSet.from_sorted([0, 3, 2])
+
+    def test_negative(self):
+        with pytest.raises(ValueError):
+            ProcSet.from_sorted([-1, 3])
+
+    @pytest.mark.parametrize('validate', (True, False))
+    def test_overflow(self, validate):
+        with pytest.raises(ValueError, match=r'^Invalid bound\(s\) greater than'):
+            ProcSet.from_sorted([0, 2**63], validate=validate)
+
+    @pytest.mark.parametrize('iterable', INCOMPATIBLE_ITER_LENGTH_TESTCASES, ids=repr)
+    def test_incompatible_iter_length(self, iterable):
+        with pytest.raises(TypeError):
+            ProcSet.from_sorted([iterable])
+
 
 # pylint: disable=no-self-use,too-many-public-methods,missing-docstring
 class TestMisc:
@@ -300,6 +384,34 @@ class TestMisc:
         pset.clear()
         assert pset == ProcSet()
 
+    @pytest.mark.parametrize(
+        'mutation',
+        (
+            lambda pset: pset.__ior__(ProcSet((20, 29))),
+            lambda pset: pset.__iand__(ProcSet((0, 4))),
+            lambda pset: pset.__isub__(ProcSet((0, 4))),
+            lambda pset: pset.__ixor__(ProcSet((5, 14))),
+            lambda pset: pset.update(12, (20, 29)),
+            lambda pset: pset.intersection_update((0, 4), (2, 8)),
+            lambda pset: pset.difference_update(3, (7, 8)),
+            lambda pset: pset.symmetric_difference_update((5, 14)),
+            lambda pset: pset.clear(),
+        )
+    )
+    def test_len_after_mutation(self, mutation):
+        pset = ProcSet((0, 9))
+        assert len(pset) == 10
+        mutation(pset)
+        assert len(pset) == len(list(pset))
+
+    def test_len_copy(self):
+        pset = ProcSet((0, 9))
+        assert len(pset) == 10
+        copy_pset = pset.copy()
+        pset |= ProcSet((20, 29))
+        assert len(pset) == 20
+        assert len(copy_pset) == 10
+
 
 # pylint: disable=no-self-use,too-many-public-methods,missing-docstring
 class TestStringParsing:
@@ -327,16 +439,139 @@ class TestStringParsing:
         pset = ProcSet.from_str('0-1 2-3')
         assert pset == ProcSet(ProcInt(0, 3))
 
+    def test_unsorted(self):
+        pset = ProcSet.from_str('8-9 0-3 5')
+        assert pset == ProcSet(ProcInt(0, 3), 5, ProcInt(8, 9))
+        assert pset.count() == 3
+
+    def test_overlapping(self):
+        pset = ProcSet.from_str('0-3 2-5 5 4')
+        assert pset == ProcSet(ProcInt(0, 5))
+        assert pset.count() == 1
+
+    def test_custom_separators(self):
+        pset = ProcSet.from_str('0:3,5,7:8', insep=':', outsep=',')
+        assert pset == ProcSet(ProcInt(0, 3), 5, ProcInt(7, 8))
+
+    def test_canonical_roundtrip(self):
+        pset = ProcSet(*range(0, 20000, 3), ProcInt(30000, 40000))
+        assert ProcSet.from_str(str(pset)) == pset
+        assert ProcSet.from_str(format(pset, ':,'), insep=':', outsep=',') == pset
+
     def test_nostring(self):
         with pytest.raises(TypeError, match=r'^from_str\(\) argument 2 must be str, not int$'):
             ProcSet.from_str(42)
 
-    @pytest.mark.parametrize('string', ('-1', '0-', '1-2-3', ))
+    @pytest.mark.parametrize(
+        'string',
+        ('-1', '0-', '1-2-3', '3-1', '0  1', '1-18446744073709551616', )
+    )
     def test_invalid_string(self, string):
         pattern = r'^Invalid interval format, parsed string is: \'{}\'$'.format(string)
         with pytest.raises(ValueError, match=pattern):
             ProcSet.from_str(string)
 
+    def test_negative_bound(self):
+        with pytest.raises(ValueError, match=r'^Invalid interval format'):
+            ProcSet.from_str('-1:3', insep=':')
+
+
+# pylint: disable=no-self-use,too-many-public-methods,missing-docstring
+class TestLinesParsing:
+    LINES = '0-3 5\n\n8-9 1\r\n4-6'
+
+    def test_iter_file(self):
+        psets = ProcSet.iter_from_lines(io.StringIO(self.LINES))
+        assert next(psets) == ProcSet(ProcInt(0, 3), 5)
+        assert list(psets) == [ProcSet(), ProcSet(1, ProcInt(8, 9)), ProcSet(ProcInt(4, 6))]
+
+    def test_iter_lazy(self):
+        lines = iter(['0-3', 'invalid'])
+        psets = ProcSet.iter_from_lines(lines)
+        assert next(psets) == ProcSet(ProcInt(0, 3))
+        with pytest.raises(ValueError, match=r'^Invalid interval format'):
+            next(psets)
+
+    def test_iter_separators(self):
+        psets = ProcSet.iter_from_lines(['0:3,5', '7'], insep=':', outsep=',')
+        assert list(psets) == [ProcSet(ProcInt(0, 3), 5), ProcSet(7)]
+
+    def test_iter_frozen(self):
+        psets = list(FrozenProcSet.iter_from_lines(['0-3', '5']))
+        assert all(isinstance(pset, FrozenProcSet) for pset in psets)
+
+    def test_union(self):
+        pset = ProcSet.from_lines(io.StringIO(self.LINES))
+        assert pset == ProcSet(ProcInt(0, 6), ProcInt(8, 9))
+        assert pset.count() == 2
+
+    def test_union_empty(self):
+        assert ProcSet.from_lines([]) == ProcSet()
+        assert isinstance(FrozenProcSet.from_lines(['0-3']), FrozenProcSet)
+
+    def test_union_many_lines(self):
+        lines = ['{} {}'.format(proc, proc + 500) for proc in range(0, 1000, 2)]
+        pset = ProcSet.from_lines(lines)
+        assert pset == ProcSet(*range(0, 1500, 2))
+
+    def test_nostring_line(self):
+        with pytest.raises(TypeError, match=r'^lines must hold str, not bytes$'):
+            ProcSet.from_lines([b'0-3'])
+
+
+# pylint: disable=no-self-use,too-many-public-methods,missing-docstring
+class TestMany:
+    PSETS = [
+        ProcSet(),
+        ProcSet(0),
+        ProcSet(ProcInt(0, 3), 5, ProcInt(8, 9)),
+        ProcSet(ProcInt(2, 2 ** 40)),
+    ]
+
+    @pytest.mark.parametrize('format_spec', ['', ':,'])
+    def test_format(self, format_spec):
+        expected = [format(pset, format_spec) for pset in self.PSETS]
+        fresh = [pset.copy() for pset in self.PSETS]
+        assert format_many(fresh, format_spec) == expected
+
+    def test_format_shared(self):
+        # small universe: the rendered bounds are shared by the whole batch
+        psets = [ProcSet(ProcInt(proc, proc + 3), proc + 5) for proc in range(100)]
+        expected = [format(pset) for pset in psets]
+        assert format_many([pset.copy() for pset in psets]) == expected
+
+    def test_format_cached(self):
+        pset = ProcSet(ProcInt(0, 3))
+        pset._formats = {'': 'cached'}  # pylint: disable=protected-access
+        assert format_many([pset, ProcSet(4)]) == ['cached', '4']
+
+    def test_format_mixed(self):
+        psets = iter([FrozenProcSet(1), ProcInt(0, 3), [4, 5]])
+        assert format_many(psets) == ['1', '0-3', '4-5']
+
+    def test_format_invalid(self):
+        with pytest.raises(ValueError, match=r'^Invalid format specifier$'):
+            format_many([ProcSet(1)], '-')
+
+    def test_parse(self):
+        strings = [format(pset) for pset in self.PSETS]
+        psets = parse_many(iter(strings))
+        assert psets == self.PSETS
+        assert all(type(pset) is ProcSet for pset in psets)  # pylint: disable=unidiomatic-typecheck
+
+    def test_parse_separators(self):
+        assert parse_many(['0:3,5', '', '9,1:2'], insep=':', outsep=',') == [
+            ProcSet(ProcInt(0, 3), 5), ProcSet(), ProcSet(ProcInt(1, 2), 9)
+        ]
+
+    def test_parse_invalid(self):
+        with pytest.raises(ValueError, match=r'^Invalid interval format'):
+            parse_many(['0-3', '3-0'])
+
+    def test_parse_nostring(self):
+        with pytest.raises(TypeError, match=r'^strings must hold str, not int$'):
+            parse_many(['0-3', 4])
+
 
 # pylint: disable=no-self-use,too-many-public-methods,missing-docstring
 class TestDisplay:
@@ -393,6 +628,92 @@ class TestDisplay:
         with pytest.raises(ValueError, match='^Invalid format specifier$'):
             format(ProcSet(), ':--')
 
+    def test_cache_invalidation(self):
+        pset = ProcSet(ProcInt(0, 3))
+        assert str(pset) == '0-3'
+        assert format(pset, ':,') == '0:3'
+        pset |= ProcSet(7)
+        assert str(pset) == '0-3 7'
+        assert format(pset, ':,') == '0:3,7'
+        pset.discard(7)
+        assert str(pset) == '0-3'
+        pset.clear()
+        assert str(pset) == ''
+
+    def test_cache_copy(self):
+        pset = ProcSet(ProcInt(0, 3))
+        assert str(pset) == '0-3'
+        pset_copy = pset.copy()
+        pset_copy.update(7)
+        assert str(pset_copy) == '0-3 7'
+        assert str(pset) == '0-3'
+
+    def test_cache_bounded(self):
+        pset = ProcSet(ProcInt(0, 3), 5)
+        specs = [sep + ' ' for sep in ':;/_+=~']
+        for spec in specs:
+            assert format(pset, spec) == '0{}3 5'.format(spec[0])
+        # pylint: disable=protected-access
+        assert len(pset._formats) < len(specs)
+        for spec in reversed(specs):
+            assert format(pset, spec) == '0{}3 5'.format(spec[0])
+
+
+# pylint: disable=no-self-use,protected-access,missing-docstring
+class TestPickle:
+    @pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+    @pytest.mark.parametrize(
+        'pset',
+        (ProcSet(), ProcSet(ProcInt(0, 3), 5), ProcSet(*range(0, 10000, 3))),
+        ids=repr
+    )
+    def test_roundtrip(self, pset, protocol):
+        unpickled = pickle.loads(pickle.dumps(pset, protocol))
+        assert type(unpickled) is ProcSet
+        assert unpickled == pset
+        assert len(unpickled) == len(pset)
+        assert str(unpickled) == str(pset)
+
+    def test_cached_state(self):
+        pset = ProcSet(ProcInt(0, 3), 5)
+        assert len(pset) == 5
+        assert str(pset) == '0-3 5'
+        assert pset[4] == 5
+        unpickled = pickle.loads(pickle.dumps(pset))
+        # the cached state is not pickled
+        assert unpickled._len is None
+        assert unpickled._ranks is None
+        assert unpickled._formats is None
+        unpickled |= ProcSet(7)
+        assert str(unpickled) == '0-3 5 7'
+
+    @pytest.mark.parametrize('data', (
+        # ProcSet(ProcInt(0, 3), 5) pickled by procset 1.0 (protocols 2 and 4)
+        b'\x80\x02cprocset\nProcSet\nq\x00)\x81q\x01N}q\x02X\x05\x00\x00\x00_itvsq\x03]q\x04('
+        b'cprocset\nProcInt\nq\x05K\x00K\x03\x86q\x06\x81q\x07h\x05K\x05K\x05\x86q\x08\x81q\tes'
+        b'\x86q\nb.',
+        b'\x80\x04\x95M\x00\x00\x00\x00\x00\x00\x00\x8c\x07procset\x94\x8c\x07ProcSet\x94\x93'
+        b'\x94)\x81\x94N}\x94\x8c\x05_itvs\x94]\x94(h\x00\x8c\x07ProcInt\x94\x93\x94K\x00K\x03'
+        b'\x86\x94\x81\x94h\x08K\x05K\x05\x86\x94\x81\x94es\x86\x94b.',
+    ))
+    def test_legacy(self, data):
+        unpickled = pickle.loads(data)
+        assert type(unpickled) is ProcSet
+        assert unpickled == ProcSet(ProcInt(0, 3), 5)
+        assert len(unpickled) == 5
+        unpickled |= ProcSet(7)
+        assert str(unpickled) == '0-3 5 7'
+
+    def test_legacy_empty(self):
+        data = (b'\x80\x04\x95+\x00\x00\x00\x00\x00\x00\x00\x8c\x07procset\x94\x8c\x07ProcSet'
+                b'\x94\x93\x94)\x81\x94N}\x94\x8c\x05_itvs\x94]\x94s\x86\x94b.')
+        assert pickle.loads(data) == ProcSet()
+
+    def test_flat_bounds(self):
+        # a ProcSet is pickled as its flat bounds, without any ProcInt
+        data = pickle.dumps(ProcSet(ProcInt(0, 3), 5), pickle.HIGHEST_PROTOCOL)
+        assert b'ProcInt' not in data
+
 
 # pylint: disable=no-self-use,protected-access,too-many-public-methods,missing-docstring
 class TestCopy:
@@ -401,7 +722,7 @@ class TestCopy:
         copy_pset = copy.copy(pset)
         assert copy_pset == pset
         assert copy_pset is not pset
-        assert copy_pset._itvs is not pset._itvs
+        assert copy_pset._bounds is not pset._bounds
         pset |= ProcSet(ProcInt(128, 255))
         assert copy_pset != pset
 
@@ -410,7 +731,7 @@ class TestCopy:
         copy_pset = copy.copy(pset)
         assert copy_pset == pset
         assert copy_pset is not pset
-        assert copy_pset._itvs is not pset._itvs
+        assert copy_pset._bounds is not pset._bounds
         pset |= ProcSet(ProcInt(128, 255))
         assert copy_pset != pset
 
@@ -431,7 +752,7 @@ class TestCopy:
         dcopy_pset = copy.deepcopy(pset)
         assert dcopy_pset == pset
         assert dcopy_pset is not pset
-        assert dcopy_pset._itvs is not pset._itvs
+        assert dcopy_pset._bounds is not pset._bounds
         pset |= ProcSet(ProcInt(128, 255))
         assert dcopy_pset != pset
 
@@ -440,7 +761,7 @@ class TestCopy:
         dcopy_pset = copy.deepcopy(pset)
         assert dcopy_pset == pset
         assert dcopy_pset is not pset
-        assert dcopy_pset._itvs is not pset._itvs
+        assert dcopy_pset._bounds is not pset._bounds
         pset |= ProcSet(ProcInt(128, 255))
         assert dcopy_pset != pset
 
@@ -526,3 +847,293 @@ class TestGetItem:
 
         for start, stop, step in itertools.product(starts, stops, steps):
             assert pset[start:stop:step] == list(pset)[start:stop:step]
+
+    def test_fragmented(self):
+        pset = ProcSet(*(i for i in range(5000) if i % 7 in (0, 2, 3)))
+        procs = list(pset)
+        for index in range(-len(procs), len(procs)):
+            assert pset[index] == procs[index]
+        assert pset[1000:3000:13] == procs[1000:3000:13]
+        assert pset[-2:500:-11] == procs[-2:500:-11]
+
+    def test_after_mutation(self):
+        pset = ProcSet((0, 3), (8, 11))
+        assert pset[5] == 9
+        pset -= ProcSet(1)
+        assert pset[5] == 10
+        assert pset[2:] == [3, 8, 9, 10, 11]
+        pset |= ProcSet((4, 7))
+        assert pset[5] == 6
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestContainsMany:
+    PSET = ProcSet((0, 3), 7, (10, 12))
+    EXPECTED = {i: i in (0, 1, 2, 3, 7, 10, 11, 12) for i in range(-2, 16)}
+
+    def test_empty_pset(self):
+        assert ProcSet().contains_many([0, 1, 5]) == [False, False, False]
+        assert ProcSet().contains_many([0, 1, 5], subset=True) == []
+
+    def test_no_items(self):
+        assert self.PSET.contains_many([]) == []
+        assert self.PSET.contains_many(iter(()), subset=True) == []
+
+    def test_sorted(self):
+        items = sorted(self.EXPECTED)
+        assert self.PSET.contains_many(items) == [self.EXPECTED[i] for i in items]
+        assert self.PSET.contains_many(iter(items), subset=True) == \
+            [i for i in items if self.EXPECTED[i]]
+
+    def test_unsorted(self):
+        items = [12, 3, 4, 4, 7, 0, 15, 10, 11, -1, 8, 7]
+        assert self.PSET.contains_many(items) == [self.EXPECTED[i] for i in items]
+        assert self.PSET.contains_many(items, subset=True) == [12, 3, 7, 0, 10, 11, 7]
+
+    def test_array(self):
+        items = array.array('q', range(-2, 16))
+        assert self.PSET.contains_many(items) == [self.EXPECTED[i] for i in items]
+
+    def test_large(self):
+        pset = ProcSet(*range(0, 10000, 3))
+        items = list(range(-5, 10005))
+        assert pset.contains_many(items) == [i in pset for i in items]
+        assert pset.contains_many(items[::-1], subset=True) == list(reversed(pset))
+
+    def test_numpy(self):
+        numpy = pytest.importorskip('numpy')
+        items = numpy.array(sorted(self.EXPECTED) + [5, 11, 0], dtype=numpy.int64)
+        mask = self.PSET.contains_many(items)
+        assert isinstance(mask, numpy.ndarray)
+        assert mask.tolist() == [self.EXPECTED[i] for i in items.tolist()]
+        subset = self.PSET.contains_many(items, subset=True)
+        assert subset.tolist() == [i for i in items.tolist() if self.EXPECTED[i]]
+        assert ProcSet().contains_many(items).tolist() == [False] * len(items)
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestBoundsArray:
+    @pytest.fixture
+    def numpy(self):
+        return pytest.importorskip('numpy')
+
+    def test_to_array(self, numpy):
+        array = ProcSet((0, 3), 5, (7, 8)).to_bounds_array()
+        assert array.dtype == numpy.int64
+        assert array.shape == (3, 2)
+        assert array.tolist() == [[0, 3], [5, 5], [7, 8]]
+
+    def test_to_array_empty(self, numpy):
+        array = ProcSet().to_bounds_array()
+        assert array.dtype == numpy.int64
+        assert array.shape == (0, 2)
+
+    def test_to_array_copy(self, numpy):
+        pset = ProcSet((0, 3))
+        array = pset.to_bounds_array()
+        array[0, 1] = 10
+        pset |= ProcSet(5)  # the ProcSet is still resizable
+        assert pset == ProcSet((0, 3), 5)
+
+    def test_from_array(self, numpy):
+        array = numpy.array([[7, 8], [0, 3], [2, 4], [5, 5], [10, 12], [11, 11]])
+        pset = ProcSet.from_bounds_array(array)
+        assert pset == ProcSet((0, 5), (7, 8), (10, 12))
+
+    def test_from_array_like(self, numpy):
+        assert ProcSet.from_bounds_array([(0, 1), (3, 3)]) == ProcSet((0, 1), 3)
+        assert ProcSet.from_bounds_array(numpy.array([[4, 5]], dtype=numpy.uint8)) == \
+            ProcSet((4, 5))
+
+    def test_from_array_max_bound(self, numpy):
+        pset = ProcSet.from_bounds_array([[0, 2 ** 63 - 1], [5, 6]])
+        assert pset == ProcSet((0, 2 ** 63 - 1))
+        assert pset.count() == 1
+        pset = ProcSet.from_bounds_array([[2 ** 63 - 1, 2 ** 63 - 1], [0, 2 ** 63 - 3]])
+        assert pset == ProcSet((0, 2 ** 63 - 3), 2 ** 63 - 1)
+
+    def test_from_array_overflow(self, numpy):
+        array = numpy.array([[0, 2**63]], dtype=numpy.uint64)
+        with pytest.raises(ValueError, match=r'^Invalid bound\(s\) greater than'):
+            ProcSet.from_bounds_array(array)
+
+    def test_from_array_empty(self, numpy):
+        assert ProcSet.from_bounds_array(numpy.empty((0, 2), dtype=numpy.int64)) == ProcSet()
+        assert ProcSet.from_bounds_array([]) == ProcSet()
+
+    def test_roundtrip(self, numpy):
+        pset = ProcSet(*range(0, 10000, 3), (20000, 30000))
+        assert ProcSet.from_bounds_array(pset.to_bounds_array()) == pset
+        frozen = FrozenProcSet.from_bounds_array(pset.to_bounds_array())
+        assert isinstance(frozen, FrozenProcSet)
+        assert frozen == pset
+
+    def test_random(self, numpy):
+        rng = numpy.random.RandomState(0)
+        infs = rng.randint(0, 5000, size=1000)
+        array = numpy.column_stack((infs, infs + rng.randint(0, 10, size=1000)))
+        expected = ProcSet(*map(tuple, array.tolist()))
+        assert ProcSet.from_bounds_array(array) == expected
+        assert ProcSet.from_bounds_array(array[::-1]) == expected
+
+    @pytest.mark.parametrize(
+        'array, exception',
+        (
+            ([[0, 1, 2]], ValueError),
+            ([0, 1], ValueError),
+            ([[3, 1]], ValueError),
+            ([[-1, 1]], ValueError),
+            ([[0.5, 1]], TypeError),
+        ),
+        ids=repr
+    )
+    def test_from_invalid_array(self, numpy, array, exception):
+        with pytest.raises(exception):
+            ProcSet.from_bounds_array(array)
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestBytes:
+    @pytest.mark.parametrize(
+        'pset',
+        (
+            ProcSet(),
+            ProcSet(0),
+            ProcSet(ProcInt(0, 3), 5, ProcInt(200, 100000)),
+            ProcSet(*range(0, 10000, 3)),
+            ProcSet(2 ** 63 - 1),
+        ),
+        ids=repr
+    )
+    def test_roundtrip(self, pset):
+        data = pset.to_bytes()
+        assert isinstance(data, bytes)
+        assert ProcSet.from_bytes(data) == pset
+        assert ProcSet.from_bytes(bytearray(data)) == pset
+        assert ProcSet.from_bytes(memoryview(data)) == pset
+
+    def test_encoding(self):
+        # version, number of intervals, then (gap, length) pairs
+        assert ProcSet().to_bytes() == b'\x01\x00'
+        assert ProcSet(ProcInt(0, 3), 5).to_bytes() == b'\x01\x02\x00\x03\x00\x00'
+        assert ProcSet(200).to_bytes() == b'\x01\x01\xc8\x01\x00'
+
+    def test_compact(self):
+        pset = ProcSet(*range(0, 100000, 2))
+        assert len(pset.to_bytes()) < len(str(pset)) // 2
+
+    def test_frozen(self):
+        fpset = FrozenProcSet.from_bytes(ProcSet(ProcInt(0, 3)).to_bytes())
+        assert isinstance(fpset, FrozenProcSet)
+        assert fpset == ProcSet(ProcInt(0, 3))
+
+    def test_nobytes(self):
+        with pytest.raises(TypeError):
+            ProcSet.from_bytes('\x01\x00')
+
+    @pytest.mark.parametrize(
+        'data, message',
+        (
+            (b'', r'^Unsupported ProcSet bytes format version: None$'),
+            (b'\x02\x00', r'^Unsupported ProcSet bytes format version: 2$'),
+            (b'\x01\x01\x00\x80', r'^Invalid ProcSet bytes: truncated data$'),
+            (b'\x01\x02\x00\x00', r'^Invalid ProcSet bytes: mismatching number of intervals$'),
+            (b'\x01\x00\x00\x00', r'^Invalid ProcSet bytes: mismatching number of intervals$'),
+            (b'\x01\x01' + b'\x80' * 9 + b'\x01\x00', r'^Invalid bound\(s\) greater than'),
+        ),
+        ids=repr
+    )
+    def test_invalid_bytes(self, data, message):
+        with pytest.raises(ValueError, match=message):
+            ProcSet.from_bytes(data)
+
+
+# pylint: disable=no-self-use,protected-access,missing-docstring
+class TestBuffer:
+    @pytest.fixture
+    def numpy(self):
+        return pytest.importorskip('numpy')
+
+    def test_as_memoryview(self):
+        pset = ProcSet(ProcInt(0, 3), 5)
+        view = pset.as_memoryview()
+        assert isinstance(view, memoryview)
+        assert view.format == 'q'
+        assert view.tolist() == [0, 3, 5, 5]
+
+    def test_as_memoryview_empty(self):
+        view = ProcSet().as_memoryview()
+        assert view.tolist() == []
+        assert view.readonly
+
+    def test_as_memoryview_readonly(self):
+        pset = ProcSet(ProcInt(0, 3), 5)
+        view = pset.as_memoryview()
+        assert view.readonly
+        with pytest.raises(TypeError):
+            view[0] = 100
+        assert pset == ProcSet(ProcInt(0, 3), 5)
+        assert 2 in pset
+
+    def test_modify_exported(self):
+        pset = ProcSet(ProcInt(0, 3), *range(10, 1000, 2))
+        view = pset.as_memoryview()
+        # small updates are spliced in place, unless the bounds are exported
+        pset |= ProcSet(5)
+        pset -= ProcSet(0)
+        assert pset == ProcSet(ProcInt(1, 3), 5, *range(10, 1000, 2))
+        assert view[:4].tolist() == [0, 3, 10, 10]
+
+    def test_from_buffer(self):
+        pset = ProcSet.from_buffer(array.array('q', (0, 3, 5, 5)))
+        assert pset == ProcSet(ProcInt(0, 3), 5)
+        assert len(pset) == 5
+        assert pset.count() == 2
+
+    def test_from_bytes_buffer(self):
+        pset = FrozenProcSet.from_buffer(array.array('q', (0, 3)).tobytes())
+        assert isinstance(pset, FrozenProcSet)
+        assert pset == ProcSet(ProcInt(0, 3))
+
+    def test_roundtrip(self):
+        pset = ProcSet(*range(0, 10000, 3), ProcInt(20000, 30000))
+        wrapped = ProcSet.from_buffer(pset.as_memoryview())
+        assert wrapped == pset
+        assert str(wrapped) == str(pset)
+
+    def test_zero_copy(self):
+        bounds = array.array('q', (0, 3, 5, 5))
+        pset = ProcSet.from_buffer(bounds)
+        bounds[3] = 7
+        assert pset == ProcSet(ProcInt(0, 3), ProcInt(5, 7))
+
+    def test_modify_wrapped(self):
+        bounds = array.array('q', (0, 3, 5, 5))
+        pset = ProcSet.from_buffer(bounds)
+        pset |= ProcSet(7)
+        pset -= ProcSet(0)
+        assert pset == ProcSet(ProcInt(1, 3), 5, 7)
+        assert bounds.tolist() == [0, 3, 5, 5]  # detached from the buffer
+
+    @pytest.mark.parametrize(
+        'buffer, exception',
+        (
+            (array.array('i', (0, 1)), TypeError),
+            ('0-1', TypeError),
+            (array.array('q', (0, )), ValueError),
+            (array.array('q', (3, 1)), ValueError),
+            (array.array('q', (-1, 1)), ValueError),
+            (array.array('q', (4, 5, 0, 1)), ValueError),
+            (array.array('q', (0, 1, 2, 3)), ValueError),
+            (array.array('q', (0, 2, 2, 3)), ValueError),
+        ),
+        ids=repr
+    )
+    def test_from_invalid_buffer(self, buffer, exception):
+        with pytest.raises(exception):
+            ProcSet.from_buffer(buffer)
+
+    def test_numpy(self, numpy):
+        pset = ProcSet(ProcInt(0, 3), 5)
+        assert numpy.asarray(pset.as_memoryview()).reshape(-1, 2).tolist() == [[0, 3], [5, 5]]
+        assert ProcSet.from_buffer(numpy.array([[0, 3], [5, 5]], dtype=numpy.int64)) == pset
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © 2017—2019
+# Contributed by Raphaël Bleuse <cs@research.bleuse.net>
+#
+# This file is part of procset.py, a pure python module to manage sets of
+# closed intervals.
+#
+#   procset.py is free software: you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License version 3 only
+#   as published by the Free Software Foundation.
+#
+#   procset.py is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License version 3 for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License version 3 along with this program.  If not, see
+#   <https://www.gnu.org/licenses/>.
+
+import copy
+import pickle
+import random
+import pytest
+from helpers import random_procset
+from procset import BitmapProcSet, FrozenProcSet, ProcInt, ProcSet, RoaringProcSet
+
+
+CHUNK_SIZE = 1 << 16  # chunk size of RoaringProcSet
+
+BACKENDS = (BitmapProcSet, RoaringProcSet)
+
+
+@pytest.fixture(name='backend', params=BACKENDS, ids=lambda backend: backend.__name__)
+def fixture_backend(request):
+    return request.param
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestNew:
+    def test_empty(self, backend):
+        bpset = backend()
+        assert list(bpset) == []
+        assert len(bpset) == 0
+        assert not bpset
+
+    def test_mixed_int_procint_procset(self, backend):
+        bpset = backend(0, (2, 6), ProcSet(3, (5, 7)), backend(9))
+        assert list(bpset) == [0, 2, 3, 4, 5, 6, 7, 9]
+        assert bpset.count() == 3
+
+    def test_to_procset(self, backend):
+        pset = ProcSet(0, (2, 6), (CHUNK_SIZE - 2, 3 * CHUNK_SIZE))
+        assert backend(pset).to_procset() == pset
+        assert type(backend(pset).to_procset()) is ProcSet
+        assert ProcSet(backend(pset)) == pset
+
+    def test_repr(self, backend):
+        bpset = backend((0, 3), 5)
+        assert repr(bpset) == '{}((0, 3), 5)'.format(backend.__name__)
+        assert bpset == eval(repr(bpset))
+        assert repr(backend()) == '{}()'.format(backend.__name__)
+
+    def test_from_str(self, backend):
+        bpset = backend.from_str('5 0-3')
+        assert isinstance(bpset, backend)
+        assert bpset == ProcSet((0, 3), 5)
+        assert backend.from_str('0:3,5', insep=':', outsep=',') == bpset
+
+    def test_from_sorted(self, backend):
+        bpset = backend.from_sorted([0, 1, ProcInt(2, 3), 5])
+        assert isinstance(bpset, backend)
+        assert bpset == ProcSet((0, 3), 5)
+
+    def test_str(self, backend):
+        bpset = backend((0, 3), 5)
+        assert str(bpset) == '0-3 5'
+        assert format(bpset, ':,') == '0:3,5'
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestMisc:
+    def test_contains(self, backend):
+        bpset = backend((2, 4), 8, *range(CHUNK_SIZE, CHUNK_SIZE + 20000, 2))
+        assert [proc in bpset for proc in range(10)] == [
+            False, False, True, True, True, False, False, False, True, False,
+        ]
+        assert CHUNK_SIZE + 2 in bpset
+        assert CHUNK_SIZE + 3 not in bpset
+        assert -1 not in bpset
+
+    def test_min_max(self, backend):
+        bpset = backend((2, 4), 3 * CHUNK_SIZE + 8)
+        assert bpset.min == 2
+        assert bpset.max == 3 * CHUNK_SIZE + 8
+        with pytest.raises(ValueError):
+            backend().min  # pylint: disable=expression-not-assigned
+        with pytest.raises(ValueError):
+            backend().max  # pylint: disable=expression-not-assigned
+
+    def test_getitem(self, backend):
+        bpset = backend((2, 4), 8)
+        assert bpset[0] == 2
+        assert bpset[-1] == 8
+        assert bpset[1:] == [3, 4, 8]
+
+    def test_aggregate(self, backend):
+        assert backend((2, 4), 8).aggregate() == backend((2, 8))
+        assert backend().aggregate() == backend()
+
+    def test_copy(self, backend):
+        bpset = backend((0, 3))
+        for bpset_copy in (bpset.copy(), copy.copy(bpset), copy.deepcopy(bpset)):
+            assert bpset_copy == bpset
+            bpset_copy |= backend(7)
+            assert bpset == backend((0, 3))
+
+    def test_pickle(self, backend):
+        bpset = backend((0, 3), 7, *range(CHUNK_SIZE, CHUNK_SIZE + 20000, 2))
+        assert pickle.loads(pickle.dumps(bpset)) == bpset
+
+    def test_unhashable(self, backend):
+        with pytest.raises(TypeError):
+            hash(backend())
+
+    def test_clear(self, backend):
+        bpset = backend((0, 3))
+        bpset.clear()
+        assert bpset == backend()
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestInteroperability:
+    def test_comparisons(self, backend):
+        pset, bpset = ProcSet((0, 3)), backend((0, 3))
+        assert pset == bpset
+        assert bpset == pset
+        assert bpset == FrozenProcSet(0, 1, 2, 3)
+        assert bpset <= pset
+        assert not bpset < pset
+        assert backend(1) < pset
+        assert bpset.issuperset(ProcInt(1, 2))
+        assert bpset.isdisjoint(ProcSet(5))
+        assert bpset.issubset([0, 1, 2, 3, 4])
+
+    def test_not_equal_other_types(self, backend):
+        assert backend() != set()
+        assert backend((0, 1)) != (0, 1)
+
+    def test_methods(self, backend):
+        bpset = backend((0, 3))
+        assert bpset.union(5, ProcSet(7)) == ProcSet((0, 3), 5, 7)
+        assert bpset.intersection((2, 9)) == ProcSet((2, 3))
+        assert bpset.difference(FrozenProcSet(1)) == ProcSet(0, (2, 3))
+        assert bpset.symmetric_difference((2, 5)) == ProcSet((0, 1), (4, 5))
+        assert isinstance(bpset.union(5), backend)
+
+    @pytest.mark.parametrize('other_backend', BACKENDS, ids=lambda backend: backend.__name__)
+    def test_backend_operands(self, backend, other_backend):
+        assert backend((0, 3)) == other_backend(0, 1, 2, 3)
+        assert backend((0, 3)) | other_backend(5) == ProcSet((0, 3), 5)
+        assert backend((0, 3)) & other_backend(2) == ProcSet(2)
+        assert isinstance(backend((0, 3)) - other_backend(2), backend)
+
+    @pytest.mark.parametrize('operator', ('__or__', '__and__', '__sub__', '__xor__'))
+    @pytest.mark.parametrize('left_type', (ProcSet, FrozenProcSet))
+    def test_procset_operators(self, backend, operator, left_type):
+        # the result has the type of the left operand, as for set and frozenset
+        left = left_type((0, 3), (CHUNK_SIZE - 2, CHUNK_SIZE + 8))
+        right = backend((2, 9), CHUNK_SIZE + 1)
+        result = getattr(left, operator)(right)
+        assert type(result) is left_type  # pylint: disable=unidiomatic-typecheck
+        assert result == getattr(ProcSet(left), operator)(ProcSet(right))
+
+    def test_procset_inplace_operators(self, backend):
+        pset = orig = ProcSet((0, 3))
+        pset |= backend((4, 5), CHUNK_SIZE)
+        pset -= backend(0)
+        pset &= backend((1, 9), CHUNK_SIZE)
+        pset ^= backend((5, 6))
+        assert pset is orig
+        assert pset == ProcSet((1, 4), 6, CHUNK_SIZE)
+
+    @pytest.mark.parametrize('left_type', (ProcSet, FrozenProcSet))
+    def test_procset_comparison_methods(self, backend, left_type):
+        pset, bpset = left_type((2, 3)), backend((0, 3), CHUNK_SIZE + 8)
+        assert pset.issubset(bpset)
+        assert not pset.issuperset(bpset)
+        assert left_type((0, CHUNK_SIZE + 9)).issuperset(bpset)
+        assert not pset.isdisjoint(bpset)
+        assert left_type(5).isdisjoint(bpset)
+
+    def test_incompatible_operand(self, backend):
+        with pytest.raises(TypeError):
+            backend() | [0, 1]  # pylint: disable=expression-not-assigned
+
+
+@pytest.mark.parametrize('seed', range(8))
+@pytest.mark.parametrize('operator', ('__or__', '__and__', '__sub__', '__xor__'))
+def test_operators(backend, seed, operator):
+    rng = random.Random(seed)
+    left, right = random_procset(rng), random_procset(rng)
+    expected = getattr(left, operator)(right)
+    result = getattr(backend(left), operator)(backend(right))
+    assert isinstance(result, backend)
+    assert result == expected
+    assert list(result.intervals()) == list(expected.intervals())
+    assert len(result) == len(expected)
+    assert result.count() == expected.count()
+
+
+@pytest.mark.parametrize('seed', range(8))
+@pytest.mark.parametrize(
+    'method',
+    ('update', 'intersection_update', 'difference_update', 'symmetric_difference_update')
+)
+def test_inplace_methods(backend, seed, method):
+    rng = random.Random(seed)
+    left, right = random_procset(rng), random_procset(rng)
+    bpset = backend(left)
+    assert getattr(bpset, method)(right) is bpset
+    assert bpset == getattr(left, method)(right)
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_comparisons(backend, seed):
+    rng = random.Random(seed)
+    left, right = random_procset(rng), random_procset(rng)
+    if seed % 2:  # exercise the subset cases
+        right |= left
+    bleft, bright = backend(left), backend(right)
+    assert (bleft <= bright) == (left <= right)
+    assert (bleft < bright) == (left < right)
+    assert (bleft >= bright) == (left >= right)
+    assert (bleft > bright) == (left > right)
+    assert bleft.isdisjoint(bright) == left.isdisjoint(right)
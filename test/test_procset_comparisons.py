@@ -26,6 +26,7 @@
 
 
 import collections
+import random
 import pytest
 from procset import ProcInt, ProcSet
 
@@ -528,3 +529,46 @@ class Test__GE__(_TestComparisonOperator):
 
 class Test__GT__(_TestComparisonOperator):
     method = '__gt__'
+
+
+# randomized test cases on big operands, checked against the builtin set
+
+def _random_operands(seed, big_size, small_size, subset):
+    rng = random.Random(seed)
+    big = set(rng.sample(range(10000), big_size))
+    big.update(range(5000, 6000))
+    small = set(rng.sample(sorted(big), small_size))
+    if not subset:
+        small.add(rng.choice([i for i in range(10000) if i not in big]))
+    return big, small
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('subset', (True, False))
+@pytest.mark.parametrize('small_size', (0, 1, 3, 10, 3000))
+@pytest.mark.parametrize(
+    'method',
+    ('isdisjoint', '__le__', '__lt__', '__ge__', '__gt__')
+)
+def test_large_operands(method, small_size, subset, seed):
+    big, small = _random_operands(seed, 3000, small_size, subset)
+    big_pset, small_pset = ProcSet(*big), ProcSet(*small)
+    assert getattr(small_pset, method)(big_pset) == getattr(small, method)(big)
+    assert getattr(big_pset, method)(small_pset) == getattr(big, method)(small)
+
+
+@pytest.mark.parametrize(
+    'method, swap',
+    (('issubset', False), ('__le__', False), ('__lt__', False),
+     ('issuperset', True), ('__ge__', True), ('__gt__', True))
+)
+def test_lazy_cardinality(method, swap):
+    # the subset tests do not compute the length of a freshly modified set
+    # pylint: disable=protected-access
+    big = ProcSet(*range(0, 20000, 2))
+    big.update(20001)
+    small = ProcSet(2, 4, 20001)
+    left, right = (big, small) if swap else (small, big)
+    assert getattr(left, method)(right)
+    assert big._len is None
+    assert small._len is None
@@ -30,6 +30,7 @@
 
 import collections
 import itertools
+import random
 import pytest
 from procset import ProcInt, ProcSet
 
@@ -2302,3 +2303,136 @@ class Test__OR__(_TestSetOperationsOperator):
     testcases = UNION_TESTCASES
     merge_method = '__or__'
     inplace_method = '__ior__'
+
+
+# randomized test cases on big operands, checked against the builtin set
+
+def _random_ids(seed, size, universe):
+    rng = random.Random(seed)
+    ids = set()
+    while len(ids) < size:
+        inf = rng.randrange(universe)
+        ids.update(range(inf, min(universe, inf + rng.choice((1, 1, 2, 5, 40)))))
+    return ids
+
+
+# (left size, right size): balanced operands, and skewed operands both ways
+LARGE_OPERANDS_SIZES = ((300, 400), (3000, 5), (5, 3000), (3000, 0), (0, 3000))
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('sizes', LARGE_OPERANDS_SIZES, ids=repr)
+@pytest.mark.parametrize('operator', ('__or__', '__and__', '__sub__', '__xor__'))
+class TestLargeOperands:
+    def test_merge(self, operator, sizes, seed):
+        left_ids = _random_ids(seed, sizes[0], 10000)
+        right_ids = _random_ids(-seed, sizes[1], 10000)
+        left_pset, right_pset = ProcSet(*left_ids), ProcSet(*right_ids)
+
+        res_pset = getattr(left_pset, operator)(right_pset)
+
+        assert left_pset == ProcSet(*left_ids)
+        assert right_pset == ProcSet(*right_ids)
+        assert res_pset == ProcSet(*getattr(left_ids, operator)(right_ids))
+        assert list(res_pset) == sorted(getattr(left_ids, operator)(right_ids))
+
+    def test_inplace(self, operator, sizes, seed):
+        left_ids = _random_ids(seed, sizes[0], 10000)
+        right_ids = _random_ids(-seed, sizes[1], 10000)
+        left_pset, right_pset = ProcSet(*left_ids), ProcSet(*right_ids)
+        left_orig = left_pset
+
+        inplace_operator = operator.replace('__', '__i', 1)
+        left_pset = getattr(left_pset, inplace_operator)(right_pset)
+
+        assert left_pset is left_orig
+        assert right_pset == ProcSet(*right_ids)
+        assert list(left_pset) == sorted(getattr(left_ids, operator)(right_ids))
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('count', (1, 2, 5, 50))
+@pytest.mark.parametrize(
+    'merge_method, inplace_method',
+    (
+        ('union', 'update'),
+        ('intersection', 'intersection_update'),
+        ('difference', 'difference_update'),
+    )
+)
+class TestManyOperands:
+    @staticmethod
+    def _operands(seed, count):
+        rng = random.Random(seed)
+        left_ids = _random_ids(seed, 2000, 3000)
+        others_ids = [
+            _random_ids(seed * count + i, rng.randrange(3000), 3000)
+            for i in range(count)
+        ]
+        # mix ProcSet, ProcInt and int operands
+        others = [ProcSet(*ids) for ids in others_ids]
+        others.append(ProcInt(10, 20))
+        others.append(42)
+        others_ids.append(set(range(10, 21)))
+        others_ids.append({42})
+        return left_ids, others_ids, others
+
+    def test_merge(self, merge_method, inplace_method, count, seed):
+        left_ids, others_ids, others = self._operands(seed, count)
+        left_pset = ProcSet(*left_ids)
+
+        res_pset = getattr(left_pset, merge_method)(*others)
+
+        assert left_pset == ProcSet(*left_ids)
+        assert list(res_pset) == sorted(getattr(left_ids, merge_method)(*others_ids))
+
+    def test_inplace(self, merge_method, inplace_method, count, seed):
+        left_ids, others_ids, others = self._operands(seed, count)
+        left_pset = ProcSet(*left_ids)
+        left_orig = left_pset
+
+        left_pset = getattr(left_pset, inplace_method)(*others)
+
+        assert left_pset is left_orig
+        assert list(left_pset) == sorted(getattr(left_ids, merge_method)(*others_ids))
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_incremental_updates(seed):
+    rng = random.Random(seed)
+    ids = _random_ids(seed, 5000, 10000)
+    pset = ProcSet(*ids)
+    pset_orig = pset
+    for _ in range(300):
+        delta_ids = _random_ids(rng.random(), rng.randrange(1, 20), 10000)
+        delta = ProcSet(*delta_ids)
+        operation = rng.choice(('|=', '-=', 'update', 'difference_update'))
+        if operation == '|=':
+            pset |= delta
+            ids |= delta_ids
+        elif operation == '-=':
+            pset -= delta
+            ids -= delta_ids
+        elif operation == 'update':
+            pset.update(*delta_ids)
+            ids.update(delta_ids)
+        else:
+            pset.difference_update(*delta.intervals())
+            ids.difference_update(delta_ids)
+        assert len(pset) == len(ids)
+    assert pset is pset_orig
+    assert list(pset) == sorted(ids)
+    assert pset == ProcSet(*ids)
+
+
+@pytest.mark.parametrize('operator', ('__or__', '__and__', '__sub__', '__xor__'))
+def test_max_bound(operator):
+    # the half-open bound past the greatest bound does not fit in 64 bits
+    left, right = ProcSet((0, 2 ** 63 - 1)), ProcSet(5, 2 ** 63 - 1)
+    expected = {
+        '__or__': ProcSet((0, 2 ** 63 - 1)),
+        '__and__': right,
+        '__sub__': ProcSet((0, 4), (6, 2 ** 63 - 2)),
+        '__xor__': ProcSet((0, 4), (6, 2 ** 63 - 2)),
+    }[operator]
+    assert getattr(left, operator)(right) == expected
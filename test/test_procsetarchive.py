@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © 2017—2019
+# Contributed by Raphaël Bleuse <cs@research.bleuse.net>
+#
+# This file is part of procset.py, a pure python module to manage sets of
+# closed intervals.
+#
+#   procset.py is free software: you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License version 3 only
+#   as published by the Free Software Foundation.
+#
+#   procset.py is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License version 3 for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License version 3 along with this program.  If not, see
+#   <https://www.gnu.org/licenses/>.
+
+import array
+import pickle
+import random
+import pytest
+from procset import FrozenProcSet, ProcInt, ProcSet, ProcSetArchive
+
+
+PSETS = (
+    ProcSet(ProcInt(0, 3), 5),
+    ProcSet(),
+    ProcSet(*range(0, 1000, 3)),
+    ProcSet(ProcInt(2 ** 40, 2 ** 41)),
+)
+
+
+@pytest.fixture(name='path')
+def fixture_path(tmpdir):
+    path = str(tmpdir.join('psets.psa'))
+    assert ProcSetArchive.write(path, iter(PSETS)) == len(PSETS)
+    return path
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestArchive:
+    def test_len(self, path):
+        with ProcSetArchive(path) as archive:
+            assert len(archive) == len(PSETS)
+
+    def test_getitem(self, path):
+        with ProcSetArchive(path) as archive:
+            for index, pset in enumerate(PSETS):
+                assert isinstance(archive[index], FrozenProcSet)
+                assert archive[index] == pset
+            assert archive[-1] == PSETS[-1]
+            assert archive[1:3] == list(PSETS[1:3])
+
+    def test_getitem_invalid(self, path):
+        with ProcSetArchive(path) as archive:
+            with pytest.raises(IndexError):
+                archive[len(PSETS)]  # pylint: disable=pointless-statement
+            with pytest.raises(TypeError):
+                archive['0']  # pylint: disable=pointless-statement
+
+    def test_iter(self, path):
+        with ProcSetArchive(path) as archive:
+            assert list(archive) == list(PSETS)
+
+    def test_empty(self, tmpdir):
+        path = str(tmpdir.join('empty.psa'))
+        assert ProcSetArchive.write(path, []) == 0
+        with ProcSetArchive(path) as archive:
+            assert len(archive) == 0
+            assert list(archive) == []
+
+    def test_mixed_input(self, tmpdir):
+        path = str(tmpdir.join('mixed.psa'))
+        ProcSetArchive.write(path, [FrozenProcSet(1), ProcInt(0, 3), 7])
+        with ProcSetArchive(path) as archive:
+            assert list(archive) == [ProcSet(1), ProcSet(ProcInt(0, 3)), ProcSet(7)]
+
+    def test_view_outlives_archive(self, path):
+        archive = ProcSetArchive(path)
+        pset = archive[0]
+        archive.close()
+        assert pset == PSETS[0]
+        assert str(pset) == '0-3 5'
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestViews:
+    def test_pickle(self, path):
+        with ProcSetArchive(path) as archive:
+            unpickled = pickle.loads(pickle.dumps(archive[0]))
+        assert isinstance(unpickled, FrozenProcSet)
+        assert unpickled == PSETS[0]
+
+    def test_hash(self, path):
+        with ProcSetArchive(path) as archive:
+            assert hash(archive[2]) == hash(FrozenProcSet(PSETS[2]))
+
+    @pytest.mark.parametrize('seed', range(8))
+    @pytest.mark.parametrize('operator', ('__or__', '__and__', '__sub__', '__xor__'))
+    def test_operators(self, tmpdir, seed, operator):
+        rng = random.Random(seed)
+        psets = [
+            ProcSet(*rng.sample(range(2000), rng.randint(0, 400)))
+            for _ in range(8)
+        ]
+        path = str(tmpdir.join('random.psa'))
+        ProcSetArchive.write(path, psets)
+        with ProcSetArchive(path) as archive:
+            for view, pset in zip(archive, psets):
+                other = rng.choice(psets)
+                assert getattr(view, operator)(other) == getattr(pset, operator)(other)
+                assert getattr(other, operator)(view) == getattr(other, operator)(pset)
+                assert (view <= other) == (pset <= other)
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestInvalidFile:
+    @pytest.mark.parametrize(
+        'data, message',
+        (
+            (b'', r'^Invalid ProcSet archive: truncated file$'),
+            (b'PROCSETS' + bytes(20), r'^Invalid ProcSet archive: truncated file$'),
+            (b'NOTPSETS' + bytes(24), r'^Invalid ProcSet archive: bad magic number$'),
+            (b'PROCSETS' + bytes(24), r'^Invalid ProcSet archive: mismatching byte order$'),
+        ),
+        ids=repr
+    )
+    def test_invalid(self, tmpdir, data, message):
+        path = tmpdir.join('invalid.psa')
+        path.write_binary(data)
+        with pytest.raises(ValueError, match=message):
+            ProcSetArchive(str(path))
+
+    def test_version(self, path):
+        with open(path, 'r+b') as file:
+            file.seek(16)
+            file.write(array.array('q', (7, )))
+        with pytest.raises(ValueError, match=r'^Unsupported ProcSet archive version: 7$'):
+            ProcSetArchive(path)
+
+    @pytest.mark.parametrize(
+        'count, message',
+        (
+            (-1, r'^Invalid ProcSet archive: negative number of ProcSets$'),
+            (1, r'^Invalid ProcSet archive: mismatching index$'),
+            (len(PSETS) + 1, r'^Invalid ProcSet archive: mismatching index$'),
+            (2 ** 40, r'^Invalid ProcSet archive: truncated file$'),
+        )
+    )
+    def test_count(self, path, count, message):
+        with open(path, 'r+b') as file:
+            file.seek(24)
+            file.write(array.array('q', (count, )))
+        with pytest.raises(ValueError, match=message):
+            ProcSetArchive(path)
+
+    def test_offsets(self, path):
+        with open(path, 'r+b') as file:
+            file.seek(-8, 2)  # last offset
+            file.write(array.array('q', (1, )))
+        with pytest.raises(ValueError, match=r'^Invalid ProcSet archive: mismatching index$'):
+            ProcSetArchive(path)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © 2017—2019
+# Contributed by Raphaël Bleuse <cs@research.bleuse.net>
+#
+# This file is part of procset.py, a pure python module to manage sets of
+# closed intervals.
+#
+#   procset.py is free software: you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License version 3 only
+#   as published by the Free Software Foundation.
+#
+#   procset.py is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License version 3 for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License version 3 along with this program.  If not, see
+#   <https://www.gnu.org/licenses/>.
+
+import random
+import pytest
+from procset import FrozenProcSet, ProcInt, ProcSet, ProcSetTimeline
+
+
+def _timeline():
+    timeline = ProcSetTimeline(ProcInt(0, 7))
+    timeline.reserve(ProcInt(0, 3), 10, 20)
+    timeline.reserve(ProcInt(4, 5), 15, 30)
+    return timeline
+
+
+def _brute_earliest(grid, duration, fits, after):
+    """Return the earliest fitting window of a discrete time grid."""
+    for start in range(after, len(grid) - duration):
+        window = grid[start]
+        for time in range(start + 1, start + duration):
+            window = window & grid[time]
+        if fits(window):
+            return start, window
+    return None
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestSteps:
+    def test_new(self):
+        timeline = ProcSetTimeline(ProcSet((0, 3), 8), start=5)
+        assert list(timeline.steps()) == [(5, FrozenProcSet((0, 3), 8))]
+        assert len(timeline) == 1
+        assert timeline.free_at(1000) == ProcSet((0, 3), 8)
+
+    def test_reserve(self):
+        timeline = _timeline()
+        assert list(timeline.steps()) == [
+            (0, ProcSet((0, 7))),
+            (10, ProcSet((4, 7))),
+            (15, ProcSet((6, 7))),
+            (20, ProcSet((0, 3), (6, 7))),
+            (30, ProcSet((0, 7))),
+        ]
+        assert all(isinstance(free, FrozenProcSet) for _, free in timeline.steps())
+        assert timeline.free_at(14.5) == ProcSet((4, 7))
+
+    def test_release(self):
+        timeline = _timeline()
+        timeline.release(ProcInt(4, 5), 15, 30)
+        timeline.release(ProcInt(0, 3), 10, 20)
+        assert list(timeline.steps()) == [(0, ProcSet((0, 7)))]
+
+    def test_merge_steps(self):
+        timeline = ProcSetTimeline(ProcInt(0, 7))
+        timeline.reserve(0, 0, 10)
+        timeline.reserve(1, 10, 20)
+        timeline.reserve(1, 0, 10)
+        timeline.reserve(0, 10, 20)
+        assert list(timeline.steps()) == [(0, ProcSet((2, 7))), (20, ProcSet((0, 7)))]
+
+    def test_reserve_busy(self):
+        timeline = _timeline()
+        with pytest.raises(ValueError, match=r'^Processors 3-4 are not free from 12 to 18$'):
+            timeline.reserve(ProcInt(3, 4), 12, 18)
+        assert len(timeline) == 5  # left untouched
+
+    def test_release_free(self):
+        timeline = _timeline()
+        with pytest.raises(ValueError, match=r'^Processors 6 are not reserved from 12 to 18$'):
+            timeline.release(6, 12, 18)
+
+    @pytest.mark.parametrize('start, end', [(5, 5), (5, 4), (-1, 4)])
+    def test_invalid_bounds(self, start, end):
+        with pytest.raises(ValueError):
+            _timeline().reserve(0, start, end)
+
+    def test_repr(self):
+        assert repr(_timeline()) == \
+            '<ProcSetTimeline 0: 0-7, 10: 4-7, 15: 6-7, 20: 0-3 6-7, 30: 0-7>'
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestEarliest:
+    def test_count(self):
+        timeline = _timeline()
+        assert timeline.earliest(10, count=8) == (0, ProcSet((0, 7)))
+        assert timeline.earliest(11, count=8) == (30, ProcSet((0, 7)))
+        assert timeline.earliest(5, count=4) == (0, ProcSet((0, 7)))
+        assert timeline.earliest(15, count=4) == (0, ProcSet((4, 7)))
+        assert timeline.earliest(30, count=3) == (20, ProcSet((0, 3), (6, 7)))
+
+    def test_count_same_procs(self):
+        # 4 processors are always free, but not the same ones
+        timeline = ProcSetTimeline(ProcInt(0, 7))
+        timeline.reserve(ProcInt(0, 3), 0, 10)
+        timeline.reserve(ProcInt(4, 7), 10, 20)
+        assert timeline.earliest(20, count=4) == (10, ProcSet((0, 3)))
+        assert timeline.earliest(10, count=4, after=5) == (10, ProcSet((0, 3)))
+
+    def test_procs(self):
+        timeline = _timeline()
+        assert timeline.earliest(12, procs=ProcInt(2, 4)) == (30, ProcSet((0, 7)))
+        assert timeline.earliest(10, procs=ProcInt(2, 4)) == (0, ProcSet((0, 7)))
+        assert timeline.earliest(20, procs=6) == (0, ProcSet((6, 7)))
+
+    def test_after(self):
+        timeline = _timeline()
+        assert timeline.earliest(5, count=8, after=3) == (3, ProcSet((0, 7)))
+        assert timeline.earliest(3, count=4, after=12) == (12, ProcSet((4, 7)))
+        assert timeline.earliest(8, count=4, after=12) == (20, ProcSet((0, 3), (6, 7)))
+
+    def test_never(self):
+        assert _timeline().earliest(1, count=9) is None
+        assert _timeline().earliest(1, procs=8) is None
+
+    @pytest.mark.parametrize('kwargs', [{}, {'count': 1, 'procs': 1}])
+    def test_invalid_request(self, kwargs):
+        with pytest.raises(TypeError):
+            _timeline().earliest(1, **kwargs)
+
+    def test_invalid_duration(self):
+        with pytest.raises(ValueError):
+            _timeline().earliest(0, count=1)
+
+    @pytest.mark.parametrize('seed', range(8))
+    def test_random(self, seed):
+        rng = random.Random(seed)
+        timeline = ProcSetTimeline(ProcInt(0, 7))
+        grid = [ProcSet((0, 7))] * 80
+        reservations = []
+        for _ in range(12):
+            procs = ProcSet(*rng.sample(range(8), rng.randint(1, 4)))
+            start = rng.randrange(40)
+            end = start + rng.randint(1, 10)
+            if all(procs <= free for free in grid[start:end]):
+                timeline.reserve(procs, start, end)
+                reservations.append((procs, start, end))
+                grid[start:end] = [free - procs for free in grid[start:end]]
+            if reservations and rng.random() < 0.3:
+                procs, start, end = reservations.pop(rng.randrange(len(reservations)))
+                timeline.release(procs, start, end)
+                grid[start:end] = [free | procs for free in grid[start:end]]
+
+        assert [timeline.free_at(time) for time in range(80)] == grid
+        for _ in range(10):
+            duration, after = rng.randint(1, 8), rng.randrange(40)
+            count = rng.randint(1, 8)
+            assert timeline.earliest(duration, count=count, after=after) == _brute_earliest(
+                grid, duration, lambda window: len(window) >= count, after
+            )
+            procs = ProcSet(*rng.sample(range(8), 3))
+            assert timeline.earliest(duration, procs=procs, after=after) == _brute_earliest(
+                grid, duration, procs.issubset, after
+            )
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © 2017—2019
+# Contributed by Raphaël Bleuse <cs@research.bleuse.net>
+#
+# This file is part of procset.py, a pure python module to manage sets of
+# closed intervals.
+#
+#   procset.py is free software: you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License version 3 only
+#   as published by the Free Software Foundation.
+#
+#   procset.py is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License version 3 for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License version 3 along with this program.  If not, see
+#   <https://www.gnu.org/licenses/>.
+
+import random
+import pytest
+from helpers import random_procset
+from procset import ProcInt, RoaringProcSet
+
+
+CHUNK_SIZE = 1 << 16
+
+
+# pylint: disable=no-self-use,missing-docstring
+class TestContainers:
+    def test_empty(self):
+        assert RoaringProcSet().containers() == []
+
+    def test_run(self):
+        assert RoaringProcSet((0, 60000)).containers() == [(0, 'run')]
+
+    def test_array(self):
+        assert RoaringProcSet(*range(0, 1000, 2)).containers() == [(0, 'array')]
+
+    def test_bitmap(self):
+        assert RoaringProcSet(*range(0, 20000, 2)).containers() == [(0, 'bitmap')]
+
+    def test_spanning_run(self):
+        rpset = RoaringProcSet((CHUNK_SIZE - 10, 2 * CHUNK_SIZE + 10))
+        assert rpset.containers() == [(0, 'run'), (1, 'run'), (2, 'run')]
+        assert rpset.count() == 1
+        assert list(rpset.intervals()) == [ProcInt(CHUNK_SIZE - 10, 2 * CHUNK_SIZE + 10)]
+
+    def test_switch_on_update(self):
+        rpset = RoaringProcSet(*range(0, 20000, 2))
+        rpset |= RoaringProcSet((0, 20000))
+        assert rpset.containers() == [(0, 'run')]
+        rpset -= RoaringProcSet(*range(1, 1000, 2))
+        assert rpset.containers() == [(0, 'run')]
+        rpset &= RoaringProcSet(*range(0, 1000, 2))
+        assert rpset.containers() == [(0, 'array')]
+        rpset -= RoaringProcSet(*range(0, 1000, 2))
+        assert rpset.containers() == []
+
+
+@pytest.mark.parametrize('seed', range(8))
+@pytest.mark.parametrize('operator', ('__or__', '__and__', '__sub__', '__xor__'))
+def test_operator_containers(seed, operator):
+    # the containers of the result are the ones of a freshly built set
+    rng = random.Random(seed)
+    left, right = random_procset(rng), random_procset(rng)
+    expected = getattr(left, operator)(right)
+    result = getattr(RoaringProcSet(left), operator)(RoaringProcSet(right))
+    assert result.containers() == RoaringProcSet(expected).containers()